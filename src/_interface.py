@@ -1,19 +1,34 @@
 from abc import ABC, abstractmethod
 from collections import deque
-import curses
 from enum import Enum
-import os
 from typing import List
 
 import pygame
 
 from .components._interfaces import ObjectInterface
+from .panel.backend import CursesBackend, RenderBackend
+from .components.object_registry import ObjectRegistry
+from .components.object_pool import ObjectPool
+from .systems.render_order import RenderOrder
+
+class RenderMode(Enum):
+    '''
+    Defines how the objects are rendered on the screen
+    '''
+
+    # every object renders to its own curses panel window
+    PANELS = 1
+
+    # every object is composited onto one screen sized frame buffer,
+    # only the changed spans are written to the screen once per frame
+    COMPOSITED = 2
 
 class EngineInterface(ABC):
     '''
     Defines the interface for the game engine
     '''
-    def __init__(self, window_width: int, window_height: int, debug_mode: bool, frame_cap: int):
+    def __init__(self, window_width: int, window_height: int, debug_mode: bool, frame_cap: int, render_mode: RenderMode = RenderMode.PANELS,
+                 backend: RenderBackend = None):
         ''' MUST HAVE THE FOLLOWING FIELDS'''
         self.frame_time_keeper = None
 
@@ -25,6 +40,8 @@ class EngineInterface(ABC):
 
         self.frame_cap = frame_cap
 
+        self.render_mode: RenderMode = render_mode
+
         self.running = True
 
         '''METRICS'''
@@ -34,37 +51,71 @@ class EngineInterface(ABC):
         self.floor = self.window_height - 6
         self.roof = 1
 
+        self.backend: RenderBackend = backend if backend is not None else CursesBackend()
+        ''' Where the frames are rendered, curses by default, e.g HeadlessBackend() renders in memory '''
+
         # UTILIZES curses
         self.stdscr = None
+
+        self.key_pressed: int = -1
+        ''' The key of this tick, -1 if none, for objects that render without a panel window '''
+
+        # the keys read from the backend and not given to a tick yet
+        self._keys: deque[int] = deque()
         
     def init(self):
-        self.init_curses() # start screen
-        self._config_window() # resize cli window
-        self.init_pygame() # initilaize sound
+        self.init_backend() # start screen
+        if self.backend.interactive: self.init_pygame() # initilaize sound
     
     def dispose(self):
-        pygame.mixer.quit()
+        if self.backend.interactive: pygame.mixer.quit()
+
+        self.backend.dispose()
     
     
-    ''' CURSES FUNCTIONS '''
-    def init_curses(self):
-        # initialize curses
-        self.stdscr = curses.initscr()
-        self.stdscr.box()
+    ''' RENDER BACKEND FUNCTIONS '''
+    def init_backend(self):
+        self.backend.init(self)
 
-        curses.curs_set(0)  # Hide cursor
-        curses.noecho()  # Don't echo keystrokes
-
-        self.stdscr.nodelay(True) # avoid waiting for key presses
-    
-    def _config_window(self): # resize the cli window
-        ''' Configures the CLI window '''
-        window_confid_command: str = f'mode con: cols={self.window_width} lines={self.window_height}'
-        os.system(window_confid_command)
+        # keep the curses screen at hand
+        self.stdscr = getattr(self.backend, 'stdscr', None)
 
     def clear_screen(self):
-        self.stdscr.clear()
-        self.stdscr.refresh()
+        self.backend.clear()
+
+        # what was rendered is no longer on the screen
+        if self.rendering_system is not None: self.rendering_system.invalidate()
+
+    def read_input(self):
+        '''
+        Queues the keys pressed since the last frame, read from the backend
+        - Only when compositing, objects with panel windows read their keys from their windows
+        '''
+        if not (self.composites and self.backend.ready): return
+
+        key: int = self.backend.read_key()
+
+        while key != -1:
+            self._keys.append(key)
+            key = self.backend.read_key()
+
+    def next_key(self):
+        '''
+        Gives the next queued key to the tick, as key_pressed
+        - Called once per tick, so every key is seen on exactly one tick,
+          keys queued on frames that run no tick wait for the next one
+        '''
+        self.key_pressed = self._keys.popleft() if self._keys else -1
+
+    @property
+    def draws_panel_windows(self) -> bool:
+        ''' True if objects should create curses panel windows to render on '''
+        return not self.debug_mode and self.render_mode == RenderMode.PANELS and self.backend.supports_panel_windows
+
+    @property
+    def composites(self) -> bool:
+        ''' True if objects are composited onto one frame, in RenderMode.COMPOSITED or on backends without panel windows '''
+        return self.render_mode == RenderMode.COMPOSITED or not self.backend.supports_panel_windows
 
 
     ''' SOUND ASSETS FUNCTIONALITY '''
@@ -74,7 +125,7 @@ class EngineInterface(ABC):
         
     # Loading sound
     def load_sound(self, file_path:str) -> pygame.mixer.Sound:
-        return pygame.mixer.Sound(file_path) if not self.debug_mode else _SoundShell()
+        return pygame.mixer.Sound(file_path) if not self.debug_mode and self.backend.interactive else _SoundShell()
         
     ''' MUST HAVE THE FOLLOWING METHODS'''       
     @abstractmethod
@@ -94,14 +145,27 @@ class GameScreenInterface(ABC):
         self.screen_effects: list = []
         '''These are effects like SpawnEffect'''
 
-        ''' OBJECTS ARRAY '''
-        self.objects: list[ObjectInterface] = []
+        ''' OBJECTS REGISTRY '''
+        self.registry: ObjectRegistry = ObjectRegistry()
+        ''' The objects of the screen, indexed by id and tag, kept in sync by addObject and removeObject '''
+
+        self.object_pool: ObjectPool = ObjectPool()
+        ''' Disposed objects acquired with acquireObject, to be reused '''
+
+        self.render_order: RenderOrder = RenderOrder()
+        ''' The objects in order of priority, kept in sync by addObject and removeObject '''
 
         self.game_instance = None
         ''' Is None if this is Game and not None if this is of type GameScreen '''
 
+    @property
+    def objects(self) -> list[ObjectInterface]:
+        ''' The objects of the screen in the order they were added '''
+        return self.registry.objects
+
     def addObject(self, obj: ObjectInterface):
-        self.objects.append(obj) # add the object to the game
+        self.registry.add(obj) # add the object to the game
+        self.render_order.add(obj)
         
         obj.onMount(
             game = self.game_instance if self.game_instance is not None else self,
@@ -109,28 +173,42 @@ class GameScreenInterface(ABC):
             ) # call object onMount method
 
     def removeObject(self, object):
-        self.objects.remove(object)
+        self.registry.remove(object)
+        self.render_order.remove(object)
 
         return self.objects
 
-    def removeObjectsAny(self, tags: list[str]) -> list[ObjectInterface]:
-        for obj in self.objects:
-            for tag in tags:
-                if tag in obj.tags:
-                    self.objects.remove(obj)
-                    break
+    def removeObjects(self, objects: List[ObjectInterface]) -> list[ObjectInterface]:
+        ''' Removes a batch of objects, the objects list is only rebuilt once '''
+        for obj in objects:
+            self.registry.remove(obj)
+            self.render_order.remove(obj)
 
         return self.objects
 
+    def removeObjectsAny(self, tags: list[str]) -> list[ObjectInterface]:
+        ''' Removes the objects that have any of the tags '''
+        return self.removeObjects(self.registry.with_any_tags(tags))
+
     def removeObjectsAll(self, tags: list[str]) -> list[ObjectInterface]:
-        for obj in self.objects:
-            for tag in tags:
-                if tag not in obj.tags: break
+        ''' Removes the objects that have all the tags '''
+        return self.removeObjects(self.registry.with_all_tags(tags))
 
-                if obj == self.objects[-1]: 
-                    self.objects.remove(obj)
+    def acquireObject(self, object_class: type, drawing, **kwargs) -> ObjectInterface:
+        '''
+        Adds an object of the class and drawing to the screen, reusing a disposed one if the pool has one
+        - e.g bullets: screen.acquireObject(Bullet, bullet_drawing, tags = ['bullet'], position = Vec2(x, y))
+        - The object goes back to the pool when it is garbage collected
+        '''
+        obj = self.object_pool.acquire(object_class, drawing, **kwargs)
 
-        return self.objects
+        self.addObject(obj)
+
+        return obj
+
+    def releaseObject(self, obj: ObjectInterface):
+        ''' Marks the object as garbage, it is released to the pool when the garbage collector disposes it '''
+        obj.isGarbage = True
 
     def addObjects(self, objs: List[ObjectInterface]): 
         [self.addObject(obj) for obj in objs]
@@ -140,7 +218,11 @@ class GameScreenInterface(ABC):
 
     def find_objects_by_tag(self, tag: str) -> List[ObjectInterface]:
         ''' Finds an object by its tag '''
-        return [obj for obj in self.objects if tag in obj.tags]
+        return self.registry.with_tag(tag)
+
+    def find_object_by_id(self, id: int) -> ObjectInterface:
+        ''' Finds an object by its id, None if it isn't on the screen '''
+        return self.registry.get(id)
 
     @abstractmethod
     def update(self, dt:int):...
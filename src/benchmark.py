@@ -0,0 +1,278 @@
+'''
+Reproducible benchmarks of the engine loop
+
+Runs GameEngine.run for a fixed number of frames on synthetic scenes, on the HeadlessBackend and with no frame cap,
+so nothing sleeps and no TTY is needed. Reports frames/sec, the per phase times of the FrameProfiler
+and the allocations of every scene, as JSON to compare runs against each other.
+
+```
+python -m src.benchmark --frames 300 --count 200 --output results.json
+python -m src.benchmark --baseline results.json
+```
+
+Scenes:
+- collidables: `count` CollidableObjects moving and colliding
+- animations: `count` objects with animated Drawings
+- stacks: `count // 10` objects drawn with deep DrawingStacks
+- spawn_storm: `count` objects spawned and despawned in waves
+'''
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .core import Game
+from .components.drawing import Drawing, DrawingStack
+from .components.object import CollidableObject, Object
+from .metrics.vec2 import Vec2
+from .panel.backend import HeadlessBackend
+from .systems.profiler import FrameProfiler
+
+
+WIDTH: int = 120
+HEIGHT: int = 40
+
+# the rows the scenes keep their objects between, so they stay in view
+ROOF: int = 2
+FLOOR: int = HEIGHT - 6
+
+
+class Scene:
+    '''
+    A synthetic scene of the benchmark
+    - setup() adds the scene's objects to the game, step() changes them once per frame
+    - Scenes only use their own Random, so every run of a scene is the same
+    '''
+    name: str = ''
+
+    def __init__(self, count: int, seed: int):
+        self.count: int = count
+        self.random: random.Random = random.Random(seed)
+
+    def setup(self, game: Game) -> None:...
+
+    def step(self, game: Game, frame: int) -> None:...
+
+    def _random_pos(self, width: int, height: int) -> Vec2:
+        return Vec2(self.random.randrange(1, WIDTH - width - 1), self.random.randrange(ROOF, FLOOR - height))
+
+
+class CollidablesScene(Scene):
+    ''' Objects moving one cell a frame, bouncing off the edges of the window, and colliding '''
+    name = 'collidables'
+
+    def setup(self, game: Game) -> None:
+        self.velocities: list[Vec2] = []
+
+        for i in range(self.count):
+            drawing = Drawing(f'collidable{i}', ['##\n##'])
+
+            game.addObject(CollidableObject(['collidable'], drawing, self._random_pos(2, 2), isPersistent = True))
+
+            self.velocities.append(Vec2(self.random.choice((-1, 1)), self.random.choice((-1, 1))))
+
+    def step(self, game: Game, frame: int) -> None:
+        for obj, velocity in zip(game.find_objects_by_tag('collidable'), self.velocities):
+            # bounce off the edges of the window
+            if not 1 <= obj.pos.x + velocity.x < WIDTH - obj.size.x - 1: velocity.x = -velocity.x
+            if not ROOF <= obj.pos.y + velocity.y < FLOOR - obj.size.y: velocity.y = -velocity.y
+
+            obj.pos += velocity
+
+
+class AnimationsScene(Scene):
+    ''' Still objects whose Drawings change state every frame '''
+    name = 'animations'
+
+    def setup(self, game: Game) -> None:
+        for i in range(self.count):
+            drawing = Drawing(f'animation{i}', ['(o)', '(-)', '(O)', '(-)'])
+
+            game.addObject(Object(['animation'], drawing, self._random_pos(3, 1), isPersistent = True))
+
+    def step(self, game: Game, frame: int) -> None:
+        for obj in game.find_objects_by_tag('animation'): obj.drawing.next_state()
+
+
+class StacksScene(Scene):
+    ''' Objects drawn with DrawingStacks of many animated, transparent drawings '''
+    name = 'stacks'
+
+    depth: int = 12
+
+    def setup(self, game: Game) -> None:
+        for i in range(max(1, self.count // 10)):
+            stack = DrawingStack(f'stack{i}', transparentChar = ' ')
+
+            for layer in range(self.depth):
+                stack.add(Drawing(f'stack{i}layer{layer}', [f'[{layer:02}]', f' {layer:02} ']))
+
+            game.addObject(Object(['stack'], stack, self._random_pos(stack.maxWidth, 1), isPersistent = True))
+
+    def step(self, game: Game, frame: int) -> None:
+        for obj in game.find_objects_by_tag('stack'): obj.drawing.next_state()
+
+
+class SpawnStormScene(Scene):
+    ''' Waves of objects spawned from the game screen's pool and despawned a few frames later '''
+    name = 'spawn_storm'
+
+    wave_frames: int = 10
+
+    def setup(self, game: Game) -> None:
+        self.drawing = Drawing('spark', ['*'])
+
+    def step(self, game: Game, frame: int) -> None:
+        if frame % self.wave_frames: return
+
+        # despawn the last wave
+        for obj in game.find_objects_by_tag('spark'): game.releaseObject(obj)
+
+        # and spawn the next
+        for _ in range(self.count):
+            game.acquireObject(CollidableObject, self.drawing, tags = ['spark'], position = self._random_pos(1, 1))
+
+
+SCENES: dict[str, type[Scene]] = {scene.name: scene for scene in (CollidablesScene, AnimationsScene, StacksScene, SpawnStormScene)}
+
+
+class _BenchmarkGame(Game):
+    ''' Runs a scene for a fixed number of frames '''
+    def __init__(self, scene: Scene, frames: int, profiler: FrameProfiler, backend: HeadlessBackend):
+        self.scene: Scene = scene
+        self.frames: int = frames
+        self.frame: int = 0
+
+        super().__init__(WIDTH, HEIGHT, frame_cap = 0, profiler = profiler, backend = backend)
+
+        self.roof = ROOF
+        self.floor = FLOOR
+
+        scene.setup(self)
+
+    def update(self, dt: int):
+        self.scene.step(self, self.frame)
+
+        self.frame += 1
+
+        if self.frame >= self.frames: self.running = False
+
+
+def run_scene(name: str, frames: int, count: int, seed: int = 0, allocations: bool = True) -> dict:
+    '''
+    Runs a scene and returns its results
+    - The timed run has no allocation tracking, allocations are measured on a second, identical run
+    '''
+    profiler = FrameProfiler(capacity = frames)
+    backend = HeadlessBackend()
+
+    game = _BenchmarkGame(SCENES[name](count, seed), frames, profiler, backend)
+
+    start = time.perf_counter()
+    game.run()
+    seconds = time.perf_counter() - start
+
+    result = {
+        'scene': name,
+        'frames': game.frame,
+        'count': count,
+        'seconds': seconds,
+        'fps': game.frame / seconds if seconds else 0.0,
+        'phases': profiler.summary(),
+        'objects': len(game.objects),
+        'bytes_written': backend.bytes_written,
+    }
+
+    if allocations: result['allocations'] = measure_allocations(name, frames, count, seed)
+
+    return result
+
+
+def measure_allocations(name: str, frames: int, count: int, seed: int = 0) -> dict:
+    ''' Runs the scene under tracemalloc, returns the peak and net bytes and the blocks allocated per frame '''
+    game = _BenchmarkGame(SCENES[name](count, seed), frames, None, HeadlessBackend())
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    game.run()
+
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+
+    return {
+        'peak_bytes': peak,
+        'net_bytes': sum(stat.size_diff for stat in stats),
+        'net_blocks_per_frame': sum(stat.count_diff for stat in stats) / max(game.frame, 1),
+    }
+
+
+def run(scenes: list[str], frames: int, count: int, seed: int = 0, allocations: bool = True) -> dict:
+    ''' Runs the scenes, returns the results with the environment they ran on '''
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'settings': {'frames': frames, 'count': count, 'seed': seed},
+        'scenes': {name: run_scene(name, frames, count, seed, allocations) for name in scenes},
+    }
+
+
+def compare(baseline: dict, results: dict) -> list[str]:
+    ''' Compares the frames/sec and frame p95 of the results to a baseline, one line per scene '''
+    lines: list[str] = []
+
+    for name, result in results['scenes'].items():
+        base = baseline['scenes'].get(name)
+
+        if base is None:
+            lines.append(f'{name:<12} no baseline')
+            continue
+
+        fps_change = result['fps'] / base['fps'] - 1 if base['fps'] else 0.0
+        p95, base_p95 = result['phases']['frame']['p95'], base['phases']['frame']['p95']
+
+        lines.append(f'{name:<12} fps {base["fps"]:9.1f} -> {result["fps"]:9.1f} ({fps_change:+.1%})   frame p95 {base_p95:7.3f} -> {p95:7.3f} ms')
+
+    return lines
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description = 'Benchmarks the engine loop on synthetic scenes')
+    parser.add_argument('--frames', type = int, default = 300, help = 'frames to run every scene for')
+    parser.add_argument('--count', type = int, default = 200, help = 'objects in every scene')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--scenes', nargs = '+', choices = list(SCENES), default = list(SCENES))
+    parser.add_argument('--no-allocations', action = 'store_true', help = 'skip the allocation runs')
+    parser.add_argument('--output', help = 'file to write the JSON results to, stdout if not given')
+    parser.add_argument('--baseline', help = 'JSON results of an earlier run to compare to')
+
+    args = parser.parse_args(argv)
+
+    results = run(args.scenes, args.frames, args.count, args.seed, not args.no_allocations)
+
+    if args.output:
+        with open(args.output, 'w', encoding = 'utf-8') as file: json.dump(results, file, indent = 2)
+    else:
+        json.dump(results, sys.stdout, indent = 2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding = 'utf-8') as file: baseline = json.load(file)
+
+        print('\n'.join(compare(baseline, results)), file = sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__': sys.exit(main())
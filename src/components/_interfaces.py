@@ -5,6 +5,67 @@ from ..utils.pars_type_sensitivity import ParsTypeSensitivity
 
 from ..metrics.vec2 import Vec2
 
+from ..utils.listeners import Listeners
+
+class Tags(list):
+    '''
+    The tags of an object, a list that lets the object's tag_listeners know whenever it is changed
+    - So obj.tags.append('boss') re-indexes the object on its game screen, just like obj.tags = ['boss']
+    '''
+    def __init__(self, owner: 'ObjectInterface', tags = ()):
+        super().__init__(tags)
+
+        self._owner: ObjectInterface = owner
+
+    def _changed(self) -> None:
+        if self._owner.tag_listeners: self._owner.tag_listeners.notify(self._owner)
+
+    def append(self, tag: str) -> None:
+        super().append(tag)
+        self._changed()
+
+    def extend(self, tags) -> None:
+        super().extend(tags)
+        self._changed()
+
+    def insert(self, index: int, tag: str) -> None:
+        super().insert(index, tag)
+        self._changed()
+
+    def remove(self, tag: str) -> None:
+        super().remove(tag)
+        self._changed()
+
+    def pop(self, index: int = -1) -> str:
+        tag = super().pop(index)
+        self._changed()
+
+        return tag
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def __setitem__(self, index, tags) -> None:
+        super().__setitem__(index, tags)
+        self._changed()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, tags) -> 'Tags':
+        super().__iadd__(tags)
+        self._changed()
+
+        return self
+
+    def __imul__(self, times: int) -> 'Tags':
+        super().__imul__(times)
+        self._changed()
+
+        return self
+
 class ObjectInterface(ParsTypeSensitivity):
     def __init__(self, drawing, tags, isPersistent):
         ParsTypeSensitivity.__init__(self,
@@ -16,7 +77,17 @@ class ObjectInterface(ParsTypeSensitivity):
                                      ])
          
         self.drawing: DrawingInterface = drawing
-        self.tags: list[str] = tags
+
+        self.tag_listeners: Listeners = Listeners()
+        ''' Called with the object whenever its tags are set or changed '''
+
+        self.tags = tags
+
+        self.id: int = None
+        ''' Stable id given by the game screen the object is added to '''
+
+        self.pool_key = None
+        ''' Set when the object is acquired from an ObjectPool, so it is released back to it when disposed '''
 
         self.effects: list = []
         self.listen_to_keys = False
@@ -36,6 +107,21 @@ class ObjectInterface(ParsTypeSensitivity):
         self.isGarbage = False # if true, the object will not be disposed
         self.isPersistent = isPersistent # if true, the object will not be disposed when out of view
 
+    @property
+    def tags(self) -> Tags:
+        '''
+        The tags of the object, setting or changing them e.g obj.tags.append('boss')
+        re-indexes the object on its game screen
+        '''
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: list[str]):
+        # a list of its own, the list given may be the tags of another object
+        self._tags = Tags(self, tags)
+
+        if self.tag_listeners: self.tag_listeners.notify(self)
+
     @abstractmethod
     def onMount(self, game = None, screen = None):...
 
@@ -49,14 +135,34 @@ class ObjectInterface(ParsTypeSensitivity):
     def dispose(self):...
 
 
+DEFAULT_LAYER: int = 1
+''' The collision layer colliders are on if none is given '''
+
+ALL_LAYERS: int = (1 << 32) - 1
+''' A collision mask of all the 32 layers '''
+
 class ColliderInterface(ParsTypeSensitivity):
-    def __init__(self, colliderFill) -> None:
+    def __init__(self, colliderFill, layer: int = DEFAULT_LAYER, mask: int = ALL_LAYERS, isStatic: bool = False) -> None:
         ParsTypeSensitivity.__init__(self, 
                                      self.__class__.__name__, 
                                      [])
         
         self.colliderFill = colliderFill
         self._collisions = []
+        self._ended_collisions = []
+
+        self.layer: int = layer
+        ''' Bitmask of the collision layers the collider is on '''
+
+        self.mask: int = mask
+        ''' Bitmask of the collision layers the collider collides with '''
+
+        self.isStatic: bool = isStatic
+        ''' Static colliders never move, they are only checked as the targets of moving colliders '''
+
+    def collides_with_layer(self, other: 'ColliderInterface') -> bool:
+        ''' Checks if the collider's mask includes a layer the other collider is on '''
+        return (self.mask & other.layer) != 0
 
     @property
     def collisions(self):
@@ -65,11 +171,24 @@ class ColliderInterface(ParsTypeSensitivity):
     @collisions.setter
     def collisions(self, _): pass
 
-    def clear_collisions(self): self._collisions = []
+    @property
+    def ended_collisions(self):
+        ''' The collisions that ended on the last tick, kept apart so collisions only holds what is touching '''
+        return self._ended_collisions
+
+    @ended_collisions.setter
+    def ended_collisions(self, _): pass
+
+    def clear_collisions(self):
+        self._collisions = []
+        self._ended_collisions = []
 
     @abstractmethod
     def collide_with(self, other: 'ColliderInterface'): pass
 
+    @abstractmethod
+    def end_collision_with(self, other: 'ColliderInterface'): pass
+
 
 class DrawingInterface(ParsTypeSensitivity):
     def __init__(self, tag: str, maxWidth: int, maxHeight: int) -> None:
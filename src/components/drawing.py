@@ -1,10 +1,39 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import List, override 
 
+import numpy as np
+
 from ..metrics.vec2 import Vec2
+from ..panel.pixels import BLANK_PIXEL, PIXEL_DTYPE, to_pixels
 
 from ._interfaces import DrawingInterface, DrawingStackInterface
 
+from ..utils.debug_log import debug_log
+
+_log = debug_log.channel('drawing')
+
+
+def _validateTransparentChar(transparentChar: 'str | None') -> None:
+    ''' A transparent character is either None or a single character '''
+    if transparentChar is not None and (not isinstance(transparentChar, str) or len(transparentChar) != 1):
+        raise ValueError(f"transparentChar must be a single character or None, {transparentChar!r} given")
+
+
+@dataclass
+class StateRaster:
+    '''
+    A state of a drawing rasterized into pixels, ready to be blitted into a FrameBuffer
+
+    Fields:
+    - glyphs(np.ndarray): 2D array of the state's pixels, lines shorter than the state are padded with blanks
+    - mask(np.ndarray): 2D bool array, True where the pixel is part of the drawing and False where it is transparent
+    - opaque(bool): True if every pixel of the state is part of the drawing
+    '''
+    glyphs: np.ndarray
+    mask: np.ndarray
+    opaque: bool
+
 
 class Drawing(DrawingInterface):
     '''
@@ -15,20 +44,29 @@ class Drawing(DrawingInterface):
             the position of the drawing relative to the canvas
         - frames(list):
             with lines(list)
+        - transparentChar(str | None):
+            the character that lets whatever is beneath the drawing show through
     '''
 
-    def __init__(self, tag = '', drawingStates: List[str] = [], stripNewLines = True, fillBlanks = False):
+    def __init__(self, tag = '', drawingStates: List[str] = [], stripNewLines = True, fillBlanks = False, transparentChar: str = None):
         '''
         To make a drawing with multiple frames
         - Takes:
             - tag(str): the id of the drawing
+            - transparentChar(str | None): a single character that is not drawn onto the buffer, 
+                e.g ' ' lets the drawings and panels beneath the drawing show through its blanks
         - Use the draw method to add a string representation of the drawing
         - Use can add multiple frames to the drawing by using the addFrame method
         '''
         super().__init__(tag, 0, 0)
 
-        print()
-        print(f'::::::::: DRAWING INIT :::::::::')
+        # validate the transparent character
+        _validateTransparentChar(transparentChar)
+
+        # cells of the drawing holding this character are skipped when blitting
+        self.transparentChar: str = transparentChar
+
+        if _log.debug_on: _log.debug(f'::::::::: DRAWING INIT :::::::::')
 
         # to track the constraints of the drawing
         self.maxWidth: int = 0
@@ -56,6 +94,14 @@ class Drawing(DrawingInterface):
         ```
         '''
 
+        # the rasterized states of the drawing
+        # built once when a state is drawn, one per item in self.states
+        self.rasters: list[StateRaster] = []
+
+        # the states masked with a transparent character given by a DrawingStack, by (character, state)
+        # built on the first blit, so the drawing itself is never changed by the stacks it is in
+        self._stack_rasters: dict[tuple[str, int], StateRaster] = {}
+
         # the index of the current frame
         self._current_state: int = 0
 
@@ -85,6 +131,26 @@ class Drawing(DrawingInterface):
         # print('STATES: ', self.states)
         return self.states[self._current_state]
 
+    def get_current_raster(self, transparentChar: str = None) -> StateRaster:
+        '''
+        Gives the current state of the drawing rasterized into pixels
+        - transparentChar, e.g the one of the DrawingStack the drawing is blitted in,
+          is masked out too if the drawing has no transparentChar of its own
+        '''
+        if transparentChar is None or self.transparentChar is not None: return self.rasters[self._current_state]
+
+        key = (transparentChar, self._current_state)
+
+        raster = self._stack_rasters.get(key)
+
+        if raster is None:
+            raster = self.rasters[self._current_state]
+
+            mask = raster.mask & (raster.glyphs != transparentChar)
+            raster = self._stack_rasters[key] = StateRaster(raster.glyphs, mask, bool(mask.all()))
+
+        return raster
+
     def next_state(self):
         ''' Sets the states of all the drawings to the following state '''
         self.current_state += 1 if self._current_state < (len(self.states) - 1) else - self._current_state
@@ -115,12 +181,12 @@ class Drawing(DrawingInterface):
         # fill the blank spaces if necessary
         # add the lines to the states list
 
-        print(f'---- InDrawingState {self.tag}:::: ')
+        if _log.debug_on: _log.debug(f'---- InDrawingState {self.tag}:::: ')
 
         # get the multilineString lines
         drawingState_lines: list[str] = stringDrawing.split('\n')
 
-        print(f'------ drawingState_lines: {drawingState_lines}')
+        if _log.debug_on: _log.debug(f'------ drawingState_lines: {drawingState_lines}')
 
         # fill the blank spaces to get a drawing that covers a uniform polygon
         # get the maximum length of the lines
@@ -135,11 +201,55 @@ class Drawing(DrawingInterface):
         #     for _ in range(self.maxHeight - len(drawingState_lines)):
         #         drawingState_lines.append(" " * maxLength)
 
-        print(f'------ Added state lines: {drawingState_lines}')
+        if _log.debug_on: _log.debug(f'------ Added state lines: {drawingState_lines}')
 
         # add the frame to the frames list
         self.states.append(drawingState_lines)
 
+        # rasterize the frame once, so it is not split into characters every frame
+        self.rasters.append(self._rasterize(drawingState_lines))
+
+    def _rasterize(self, lines: list[str]) -> StateRaster:
+        '''
+        Converts the lines of a state to a 2D array of pixels and its mask
+        - The pixels past the end of a line are not part of the drawing
+        - Neither are the pixels holding the transparentChar
+        '''
+        width: int = max([len(line) for line in lines])
+
+        glyphs = np.full((len(lines), width), BLANK_PIXEL, dtype = PIXEL_DTYPE)
+        mask = np.zeros((len(lines), width), dtype = bool)
+
+        for y, line in enumerate(lines):
+            glyphs[y, :len(line)] = to_pixels(line)
+            mask[y, :len(line)] = True
+
+        # mask out the transparent pixels
+        if self.transparentChar is not None: mask &= glyphs != self.transparentChar
+
+        return StateRaster(glyphs, mask, bool(mask.all()))
+
+    def setTransparentChar(self, transparentChar: 'str | None'):
+        '''
+        Changes the transparent character of the drawing and rasterizes its states again
+        '''
+        _validateTransparentChar(transparentChar)
+
+        self.transparentChar = transparentChar
+
+        self.rasters = [self._rasterize(lines) for lines in self.states]
+        self._stack_rasters = {}
+
+    def replaceState(self, state: int, stringDrawing: str):
+        '''
+        Replaces the drawing of a state and rasterizes it again
+        '''
+        drawingState_lines: list[str] = stringDrawing.split('\n')
+
+        self.states[state] = drawingState_lines
+        self.rasters[state] = self._rasterize(drawingState_lines)
+        self._stack_rasters = {}
+
     @override
     def draw(self, stringDrawing: str = "", stripNewLines: bool = True, fillBlanks: bool = False,):
         '''
@@ -156,15 +266,14 @@ class Drawing(DrawingInterface):
                 - to fill the blank spaces with a " " character
                 - this ensures the drawing is a polygon
         '''
-        print()
-        print(f'DRAWING {self.tag} STARTED:::::')
+        if _log.debug_on: _log.debug(f'DRAWING {self.tag} STARTED:::::')
 
         # strip newlines for state if necessary
         # strip newlines for every state if necessary
         if stripNewLines:
             stringDrawing.strip('\n')
         
-        print(f'--STRIPPED DRAWING: |{stringDrawing}|')
+        if _log.debug_on: _log.debug(f'--STRIPPED DRAWING: |{stringDrawing}|')
 
         # set maximum constraints of the drawing
         self._setMaxConstraints([stringDrawing])
@@ -172,7 +281,7 @@ class Drawing(DrawingInterface):
         # make the frame
         self._drawState(stringDrawing, stripNewLines = stripNewLines, fillBlanks=fillBlanks)
 
-        print(f'--DRAWING STATES: {self.states}')
+        if _log.debug_on: _log.debug(f'--DRAWING STATES: {self.states}')
 
         return self
 
@@ -184,8 +293,8 @@ class Drawing(DrawingInterface):
             - frames: a list os Strings that are the drawing
         '''
         
-        print(f'-- DRAWING {self.tag} States Started :::::')
-        print(f'-- DRAWING {self.tag} States: {states}')
+        if _log.debug_on: _log.debug(f'-- DRAWING {self.tag} States Started :::::')
+        if _log.debug_on: _log.debug(f'-- DRAWING {self.tag} States: {states}')
 
         # strip newlines for every state if necessary
         if stripNewLines:
@@ -202,7 +311,7 @@ class Drawing(DrawingInterface):
                 fillBlanks = fillBlanks,
                 )
 
-        print(f'--DRAWING States: {self.states}')
+        if _log.debug_on: _log.debug(f'--DRAWING States: {self.states}')
 
 
     def _getMaxWidth(self, states: list[str]) -> int:
@@ -235,23 +344,24 @@ class Drawing(DrawingInterface):
         return maxHeight
     
     def _setMaxConstraints(self, states: list[str]):
-        print('STATES: ', states)
+        if _log.debug_on: _log.debug(f'STATES: {states}')
         # set max width
         self.maxWidth = self._getMaxWidth(states)
 
         # set max height
         self.maxHeight = self._getMaxHeight(states)
 
-        print(f'----DRAWING CONSTRAINTS: w:{self.maxWidth}, h:{self.maxHeight}')
+        if _log.debug_on: _log.debug(f'----DRAWING CONSTRAINTS: w:{self.maxWidth}, h:{self.maxHeight}')
         
 
     def copy(self):
         # create a new drawing with the same tag and constraints
         # reset all the variables to their default values
-        copy_of_self = Drawing(tag = self.tag)
+        copy_of_self = Drawing(tag = self.tag, transparentChar = self.transparentChar)
         copy_of_self.maxWidth = self.maxWidth
         copy_of_self.maxHeight = self.maxHeight
         copy_of_self.states = self.states
+        copy_of_self.rasters = self.rasters
         
         return copy_of_self
     
@@ -267,14 +377,19 @@ class StackDirection(Enum):
 
 class DrawingStack( DrawingStackInterface, DrawingInterface):
 
-    def __init__(self, tag: str = "", maxWidth:int = 0, maxHeight:int = 0):
+    def __init__(self, tag: str = "", maxWidth:int = 0, maxHeight:int = 0, transparentChar: str = None):
         DrawingInterface.__init__(self, tag, maxWidth, maxHeight)
         DrawingStackInterface.__init__(self)
 
+        _validateTransparentChar(transparentChar)
+
+        # masked out of the drawings of the stack that have no transparentChar of their own when they are blitted,
+        # so the drawings beneath them in the stack show through
+        self.transparentChar: str = transparentChar
+
         self._current_state: int = 0
 
-        print()
-        print(f'::::::::: DRAWING STACK INIT :::::::::')
+        if _log.debug_on: _log.debug(f'::::::::: DRAWING STACK INIT :::::::::')
 
     '''
     SETTERS AND GETTERS FOR PROPERTIES
@@ -373,8 +488,7 @@ class DrawingStack( DrawingStackInterface, DrawingInterface):
         - if the stackDirection is StackDirection.VERTICAL, the drawing will be added to the end of the height
         '''
         
-        print()
-        print(f'-- ADDING DRAWING {drawing.tag} To the Stack ::::::::')
+        if _log.debug_on: _log.debug(f'-- ADDING DRAWING {drawing.tag} To the Stack ::::::::')
 
         # set the drawing's local position
         drawing = self._setDrawingLocalPos(drawing, stackDirection)
@@ -393,9 +507,9 @@ class DrawingStack( DrawingStackInterface, DrawingInterface):
         '''
         Sets the drawing's local position
         '''
-        print(f'---- ****************Setting Local Position of {drawing.tag} ::::::::')
-        print(f'---- size of drawing: {drawing.maxWidth, drawing.maxHeight}')
-        print(f'size of self {self.maxWidth, self.maxHeight}')
+        if _log.debug_on: _log.debug(f'---- ****************Setting Local Position of {drawing.tag} ::::::::')
+        if _log.debug_on: _log.debug(f'---- size of drawing: {drawing.maxWidth, drawing.maxHeight}')
+        if _log.debug_on: _log.debug(f'size of self {self.maxWidth, self.maxHeight}')
 
         # print(f'DRAWING {drawing.tag} SIZE: {drawing.maxWidth, drawing.maxHeight}')
         # get the last drawing in the stack
@@ -3,13 +3,17 @@ from typing import List, override
 
 from ..components.drawing import Drawing
 
-from ._interfaces import ColliderInterface, ObjectInterface, DrawingInterface
+from ._interfaces import ALL_LAYERS, DEFAULT_LAYER, ColliderInterface, ObjectInterface, DrawingInterface
 
 from ..effects._interfaces import Effect
 
 from ..metrics.vec2 import Vec2
 from ..panel.panel import Panel
 
+from ..utils.debug_log import debug_log
+
+_log = debug_log.channel('render')
+
 class Object(Panel, ObjectInterface):
     '''
     # Inheriting this class 
@@ -87,6 +91,9 @@ class Object(Panel, ObjectInterface):
         self._back_position: Vec2 = None
         self._back_size :Vec2 = None
         self._back_priority = None
+
+        # the game the object is mounted on
+        self._game = None
  
     def addEffect(self, effect: Effect):
         ''' Takes an Effect and adds it to the list of effects
@@ -101,8 +108,59 @@ class Object(Panel, ObjectInterface):
 
     @override
     def onMount(self, game = None, screen = None):
+        self._game = game
+
         return super().onMount(game=game, screen=screen)
 
+    @override
+    def scan_key(self) -> int:
+        '''
+        Gets the key pressed
+        - From the object's panel window, or from the key the game gave this tick
+          when the object has no panel window e.g in RenderMode.COMPOSITED
+        '''
+        if self.panel_window_exists() or self._game is None: return super().scan_key()
+
+        return self._game.key_pressed if self.listen_for_key_press() else -1
+
+    def reset(self, tags: list[str] = None, position: Vec2 = None, priority: int = None, isPersistent: bool = None):
+        '''
+        Resets a disposed object so it can be reused by an ObjectPool
+        - The arguments left None keep their values, the ObjectPool passes the constructor's defaults for them
+        - The object keeps its drawing, panel, buffers and bounds
+        - Its panel window is created again when it is next rendered
+        '''
+        if tags is not None: self.tags = tags
+        if priority is not None: self.priority = priority
+        if isPersistent is not None: self.isPersistent = isPersistent
+
+        # copy the position, the Vec2 given may belong to another object
+        if position is not None: self.pos = Vec2(position.x, position.y)
+
+        self.isGarbage = False
+        self.effects = []
+        self.keys_pressed = []
+
+        # reset the position flags
+        self.in_view = True
+        self.on_floor = False
+        self.below_floor = False
+        self.on_roof = False
+        self.above_roof = False
+        self.past_right_extreme = False
+        self.past_left_extreme = False
+
+        # forget the last render, so the object is rendered again in full
+        self._back_position = None
+        self._back_size = None
+
+        self._back_buffer.clear()
+        self._front_buffer.clear()
+        self.staged_bytes = 0
+
+        # update bounds
+        self.bounds.pos = self.pos
+
     @override
     def dispose(self): 
         '''
@@ -166,7 +224,7 @@ class Object(Panel, ObjectInterface):
     def _check_for_new_config(self) -> bool:
         ''' Checks if the object's metrics have changed since the last time it was rendered'''
         
-        print(f'BACK POS: {self._back_position}')
+        if _log.debug_on: _log.debug(f'BACK POS: {self._back_position}')
 
         # if back configd are empty, then the object has never been rendered before
         if (self._back_position is None or self._back_size is None): return True
@@ -184,7 +242,7 @@ class Object(Panel, ObjectInterface):
         - It first reconfigures the panel_window if the metrics have changed
         - Then, It calls the panel's redraw method
         '''   
-        print(f'----Re rendering')
+        if _log.debug_on: _log.debug(f'----Re rendering')
 
         if self.isGarbage: return
 
@@ -203,9 +261,9 @@ class Object(Panel, ObjectInterface):
     def _reconfigurePanelWindow(self, game) -> bool:
         ''' Handles the change in the metrics of the 
          - Repositiong and resizing the object's panel_window
-         - Since repositioning and resizing the panel_window is weirdly non-functional in curses,
-         this function is a workaround to rebuild the panel_window in the new position and size.
-         The approach works but it is very costly.
+         - The panel_window is moved and resized in place with curses.panel,
+         it is only rebuilt in the new position and size if moving or resizing it fails
+         - The panel_window is destroyed when the object goes out of view
         '''
     
         
@@ -214,7 +272,7 @@ class Object(Panel, ObjectInterface):
         if self._back_position is None or self._back_position is None:
             # create panel window
             # only if the object is in view
-            if not game.debug_mode and self.in_view: self.createPanelWindow(self.size, self.pos)
+            if game.draws_panel_windows and self.in_view: self.createPanelWindow(self.size, self.pos)
 
             self._back_position = Vec2().replace_with(self.pos)
             self._back_size = Vec2().replace_with(self.size)
@@ -223,14 +281,15 @@ class Object(Panel, ObjectInterface):
             # if the position has changed
             # - reposition the panel_window
             if not self._back_position == self.pos:
-                self.destroyWindow()
-                if not game.debug_mode and self.in_view: self.reposition_window()
+                if game.draws_panel_windows and self.in_view: self.reposition_window()
+                else: self.destroyWindow()
+
                 self._back_position.replace_with(self.pos)
 
             # if the size has changed
             if not self._back_size == self.size:
-                self.destroyWindow()
-                if not game.debug_mode and self.in_view: self.panelWindow.resize(self.size.y, self.size.x)
+                if game.draws_panel_windows and self.in_view: self.resize_window()
+                else: self.destroyWindow()
                 
                 # update the back_size
                 self._back_size.replace_with(self.size)
@@ -267,16 +326,25 @@ class CollisionData:
         self.collisionType = collisionType
 
 class Collider(ColliderInterface):
-    def __init__(self, colliderFill: ColliderFill):
+    '''
+    - layer is the bitmask of collision layers the collider is on,
+      mask the bitmask of layers it collides with e.g bullets collide with enemies but not with bullets
+    - A static collider e.g walls and floors, never moves, so it is only checked as the target of moving colliders
+    - collisions holds the START and CONTINUING collisions of the last tick, ended_collisions the END ones
+    '''
+    def __init__(self, colliderFill: ColliderFill, layer: int = DEFAULT_LAYER, mask: int = ALL_LAYERS, isStatic: bool = False):
         
         # a list of the objects the collier has collided with
         self._collisions: List[CollisionData] = []
 
-        super().__init__(colliderFill)
+        super().__init__(colliderFill, layer, mask, isStatic)
 
     def collide_with(self, other: ObjectInterface, collisionType: 'CollisionType'):
         self._collisions.append(CollisionData(other, collisionType))
 
+    def end_collision_with(self, other: ObjectInterface):
+        self._ended_collisions.append(CollisionData(other, CollisionType.END))
+
     
 ''''
 Object that can collide with other objects that have a collider.
@@ -290,24 +358,39 @@ class CollidableObject (Object, Collider):
                  position: Vec2 = Vec2(0, 0), 
                  priority: int =0, 
                  colliderFill: ColliderFill = ColliderFill.FILLED,
-                 isPersistent = False
+                 isPersistent = False,
+                 layer: int = DEFAULT_LAYER,
+                 mask: int = ALL_LAYERS,
+                 isStatic: bool = False
                  ):
         
         Object.__init__(self, tags = tags,  drawing = drawing, position=position, priority=priority, isPersistent = isPersistent)
-        Collider.__init__(self, colliderFill)
+        Collider.__init__(self, colliderFill, layer, mask, isStatic)
 
     @override
     def dispose(self):
         self.clear_collisions()
         super().dispose()
 
+    @override
+    def reset(self, tags: list[str] = None, position: Vec2 = None, priority: int = None, isPersistent: bool = None,
+              colliderFill: ColliderFill = None, layer: int = None, mask: int = None, isStatic: bool = None):
+        self.clear_collisions()
+
+        if colliderFill is not None: self.colliderFill = colliderFill
+        if layer is not None: self.layer = layer
+        if mask is not None: self.mask = mask
+        if isStatic is not None: self.isStatic = isStatic
+
+        super().reset(tags, position, priority, isPersistent)
+
     @override
     def collide_with(self, other: ObjectInterface, collisionType: CollisionType):
         ''' Takes another object and checks if they are colliding
         '''
         # if this is on top of the other object
         # this is on the floor
-        if self.position.y + self.size.y  == other.position.y:
+        if collisionType != CollisionType.END and self.position.y + self.size.y  == other.position.y:
             self.on_floor = True
 
         return super().collide_with(other, collisionType)
@@ -334,4 +417,4 @@ class TextBox(Object):
     
     @text.setter
     def text(self, new_text: str):
-        self.drawing.states[0] = new_text
\ No newline at end of file
+        self.drawing.replaceState(0, new_text)
\ No newline at end of file
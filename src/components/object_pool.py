@@ -0,0 +1,151 @@
+import inspect
+
+from ._interfaces import DrawingInterface, ObjectInterface
+
+
+def _keyword_parameters(object_class: type, method: str) -> dict[str, object]:
+    '''
+    The keyword parameters of the class's method and their defaults, inspect.Parameter.empty if one has none
+    - Followed up the classes the method is inherited from for as long as each takes **kwargs,
+      e.g Bullet.reset(self, velocity = None, **kwargs) also takes the parameters of CollidableObject.reset
+    '''
+    parameters: dict[str, object] = {}
+
+    for klass in object_class.__mro__:
+        function = klass.__dict__.get(method)
+
+        if function is None: continue
+
+        takes_kwargs: bool = False
+
+        for parameter in list(inspect.signature(function).parameters.values())[1:]:
+            if parameter.kind == inspect.Parameter.VAR_KEYWORD: takes_kwargs = True
+            elif parameter.kind != inspect.Parameter.VAR_POSITIONAL: parameters.setdefault(parameter.name, parameter.default)
+
+        if not takes_kwargs: break
+
+    return parameters
+
+
+class ObjectPool:
+    '''
+    Keeps disposed objects to be reset and reused instead of constructing new ones
+    - Objects are pooled by their class and the Drawing they were constructed with
+    - A reused object is reset with the keyword arguments given, and the constructor's defaults for the rest,
+      so it is the same as a newly constructed one
+    - Classes pooled with arguments of their own override reset() to take them, e.g:
+
+    ```python
+     class Bullet(CollidableObject):
+        def __init__(self, velocity: Vec2 = Vec2(0, 0), **kwargs):
+            super().__init__(**kwargs)
+            self.velocity = Vec2(velocity.x, velocity.y)
+
+        @override
+        def reset(self, velocity: Vec2 = None, **kwargs):
+            if velocity is not None: self.velocity = Vec2(velocity.x, velocity.y)
+            super().reset(**kwargs)
+    ```
+    - Only objects acquired from the pool are released back to it
+    - Objects released on a frame can only be acquired from the next frame,
+      after every system has seen them leave the game screen
+    '''
+    def __init__(self, max_per_key: int = 256):
+        self.max_per_key: int = max_per_key
+        ''' The most free objects kept for every (class, drawing), the rest are dropped '''
+
+        # the free objects of every (class, drawing)
+        self._free: dict[tuple[type, int], list[ObjectInterface]] = {}
+
+        # the arguments of every class's reset(), with the defaults of its constructor
+        self._reset_arguments: dict[type, dict[str, object]] = {}
+
+        # the objects released on this frame
+        self._released: list[ObjectInterface] = []
+
+        self.reused: int = 0
+        ''' The number of objects acquired from the pool instead of being constructed '''
+
+        self.constructed: int = 0
+        ''' The number of objects constructed by the pool '''
+
+    def __len__(self) -> int:
+        return sum(len(free) for free in self._free.values())
+
+    def key(self, object_class: type, drawing: DrawingInterface) -> tuple[type, int]:
+        ''' The key objects of the class and drawing are pooled under '''
+        return (object_class, id(drawing))
+
+    def reset_arguments(self, object_class: type) -> dict[str, object]:
+        '''
+        The arguments of the class's reset(), with the defaults of its constructor
+        - inspect.Parameter.empty if the constructor has no default for one, the reset object keeps its value then
+        '''
+        arguments = self._reset_arguments.get(object_class)
+
+        if arguments is None:
+            constructor = _keyword_parameters(object_class, '__init__')
+
+            arguments = self._reset_arguments[object_class] = {
+                name: constructor.get(name, inspect.Parameter.empty) for name in _keyword_parameters(object_class, 'reset')
+            }
+
+        return arguments
+
+    def acquire(self, object_class: type, drawing: DrawingInterface, **kwargs) -> ObjectInterface:
+        '''
+        Returns a free object of the class and drawing, reset with the keyword arguments,
+        or constructs a new one with them if there is none
+        - The arguments not given are reset to the constructor's defaults
+        - Raises TypeError if the class's reset() can't take one of the arguments,
+          the object could not be reused with it
+        '''
+        reset_arguments = self.reset_arguments(object_class)
+
+        unknown = [name for name in kwargs if name not in reset_arguments]
+
+        if unknown:
+            raise TypeError(f'{object_class.__name__}.reset() does not take {unknown}, '
+                            f'override reset() to take them so {object_class.__name__} can be pooled')
+
+        key = self.key(object_class, drawing)
+
+        free = self._free.get(key)
+
+        if free:
+            obj = free.pop()
+            obj.reset(**{
+                name: kwargs.get(name, default)
+                for name, default in reset_arguments.items()
+                if name in kwargs or default is not inspect.Parameter.empty
+            })
+
+            self.reused += 1
+        else:
+            obj = object_class(drawing = drawing, **kwargs)
+
+            self.constructed += 1
+
+        obj.pool_key = key
+
+        return obj
+
+    def release(self, object: ObjectInterface) -> None:
+        ''' Takes back a disposed object that was acquired from the pool '''
+        if object.pool_key is None: return
+
+        self._released.append(object)
+
+    def recycle(self) -> None:
+        ''' Makes the objects released on the last frame free to be acquired, called once per frame '''
+        for obj in self._released:
+            free = self._free.setdefault(obj.pool_key, [])
+
+            if len(free) < self.max_per_key: free.append(obj)
+
+        self._released = []
+
+    def clear(self) -> None:
+        ''' Drops all the pooled objects '''
+        self._free = {}
+        self._released = []
@@ -0,0 +1,115 @@
+from ._interfaces import ObjectInterface
+
+from ..utils.buckets import Buckets
+
+
+class ObjectRegistry:
+    '''
+    Holds the objects of a game screen, indexed by id and by tag
+    - Every object is given a stable id when it is added, ids are never reused
+    - Adding, removing and looking objects up by tag are O(1)
+    - The tags of an object are indexed when it is added, and re-indexed whenever they are set or changed
+    '''
+    def __init__(self):
+        # the objects by id, in the order they were added
+        self._objects: dict[int, ObjectInterface] = {}
+
+        # the objects of every tag, in the order they were added
+        self._tags: Buckets = Buckets()
+
+        # the tags every object is indexed under
+        self._object_tags: dict[ObjectInterface, tuple[str, ...]] = {}
+
+        self._next_id: int = 0
+
+        # the objects as a list, None until the next read after a change
+        self._listed: list[ObjectInterface] = None
+
+    def __contains__(self, object: ObjectInterface) -> bool:
+        return object in self._object_tags
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    @property
+    def objects(self) -> list[ObjectInterface]:
+        '''
+        Returns the objects in the order they were added
+        - The list is only rebuilt after a change, don't modify it
+        '''
+        if self._listed is None: self._listed = list(self._objects.values())
+
+        return self._listed
+
+    def add(self, object: ObjectInterface) -> int:
+        ''' Adds the object, indexes its tags and returns its id '''
+        if object in self._object_tags: return object.id
+
+        object.id = self._next_id
+        self._next_id += 1
+
+        self._objects[object.id] = object
+        self._index(object)
+
+        object.tag_listeners.add(self.retag)
+
+        self._listed = None
+
+        return object.id
+
+    def remove(self, object: ObjectInterface) -> None:
+        ''' Removes the object and its tags from the registry '''
+        if object not in self._object_tags: return
+
+        object.tag_listeners.remove(self.retag)
+
+        del self._objects[object.id]
+        self._unindex(object)
+
+        self._listed = None
+
+    def retag(self, object: ObjectInterface) -> None:
+        ''' Re-indexes the tags of the object, called when they are set or changed '''
+        if object not in self._object_tags: return
+
+        self._unindex(object)
+        self._index(object)
+
+    def get(self, id: int) -> ObjectInterface:
+        ''' Returns the object with the id, None if there is none '''
+        return self._objects.get(id)
+
+    def with_tag(self, tag: str) -> list[ObjectInterface]:
+        ''' Returns the objects that have the tag '''
+        return list(self._tags.get(tag))
+
+    def with_any_tags(self, tags: list[str]) -> list[ObjectInterface]:
+        ''' Returns the objects that have at least one of the tags '''
+        found: dict[ObjectInterface, None] = {}
+
+        for tag in tags: found.update(self._tags.get(tag))
+
+        return list(found)
+
+    def with_all_tags(self, tags: list[str]) -> list[ObjectInterface]:
+        ''' Returns the objects that have all the tags '''
+        if not tags: return []
+
+        # start from the smallest set of objects
+        buckets = sorted((self._tags.get(tag) for tag in tags), key = len)
+
+        return [obj for obj in buckets[0] if all(obj in bucket for bucket in buckets[1:])]
+
+    def _index(self, object: ObjectInterface) -> None:
+        # a snapshot, to unindex the object by the tags it had once they change
+        tags = tuple(object.tags)
+
+        for tag in tags: self._tags.add(tag, object)
+
+        self._object_tags[object] = tags
+
+    def _unindex(self, object: ObjectInterface) -> None:
+        for tag in self._object_tags.pop(object): self._tags.discard(tag, object)
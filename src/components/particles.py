@@ -0,0 +1,134 @@
+from typing import override
+
+import numpy as np
+
+from .drawing import Drawing
+from .object import Object
+
+from ..metrics.vec2 import Vec2
+from ..panel.pixels import PIXEL_DTYPE
+
+
+class ParticleEmitter(Object):
+    '''
+    An object that draws many short lived particles, e.g sparks, on one panel
+    - The position, velocity, lifetime and glyph of every particle are kept in NumPy arrays,
+      and all the particles are updated in one vectorized step every frame
+    - The particles are blitted into the emitter's one FrameBuffer, there is no Object per particle
+    - Is added to a game screen like any other object
+
+    ```python
+     sparks = ParticleEmitter(size = Vec2(40, 20), position = Vec2(0, 0), gravity = Vec2(0, 9))
+     screen.addObject(sparks)
+
+     sparks.emit(200, position = Vec2(20, 10), velocity = Vec2(0, -6), spread = 4, lifetime = 800, glyphs = '*+.')
+    ```
+
+    - Positions are relative to the emitter's panel, velocities and gravity are in cells per second,
+      lifetimes in milliseconds
+    - Particles that die or leave the emitter's panel are dropped
+    '''
+    def __init__(self, size: Vec2, position: Vec2 = Vec2(0, 0), capacity: int = 10_000, gravity: Vec2 = Vec2(0, 0),
+                 tags: list[str] = [], priority: int = 0, isPersistent = True, seed: int = None):
+        # a blank, transparent drawing covering the emitter's area
+        drawing = Drawing(tag = 'particles', drawingStates = ['\n'.join([' ' * size.x] * size.y)], transparentChar = ' ')
+
+        super().__init__(tags = tags, drawing = drawing, position = position, priority = priority, isPersistent = isPersistent)
+
+        self.capacity: int = capacity
+        ''' The most particles alive at once, particles emitted past it are dropped '''
+
+        self.gravity: Vec2 = gravity
+        ''' Acceleration of all the particles, cells per second squared '''
+
+        self._rng = np.random.default_rng(seed)
+
+        # the particles, only the first self.count are alive
+        self._positions = np.zeros((capacity, 2), dtype = np.float32)
+        self._velocities = np.zeros((capacity, 2), dtype = np.float32)
+        self._lifetimes = np.zeros(capacity, dtype = np.float32)
+        self._glyphs = np.zeros(capacity, dtype = PIXEL_DTYPE)
+
+        self.count: int = 0
+        ''' The number of particles alive '''
+
+    def emit(self, count: int, position: Vec2, velocity: Vec2 = Vec2(0, 0), spread: float = 0, lifetime: float = 1000, glyphs: str = '*') -> int:
+        '''
+        Emits particles from position
+        - Every particle gets velocity plus a random offset of up to spread on each axis,
+          and a glyph picked at random from glyphs
+        - Returns the number of particles emitted, fewer than count if the emitter is full
+        '''
+        count = min(count, self.capacity - self.count)
+
+        if count <= 0: return 0
+
+        new = slice(self.count, self.count + count)
+
+        self._positions[new] = (position.x, position.y)
+        self._velocities[new] = (velocity.x, velocity.y)
+        if spread: self._velocities[new] += self._rng.uniform(-spread, spread, (count, 2))
+
+        self._lifetimes[new] = lifetime
+        self._glyphs[new] = self._rng.choice(np.array(list(glyphs), dtype = PIXEL_DTYPE), count)
+
+        self.count += count
+
+        return count
+
+    def clear_particles(self):
+        ''' Drops all the particles '''
+        self.count = 0
+
+    @override
+    def update(self, dt: float = 0, game = None):
+        '''
+        Moves all the particles, drops the dead ones and blits the rest into the panel
+        '''
+        if self.isGarbage: return
+
+        self._update_pos_flags(game)
+
+        self._step(dt)
+
+        # clear the back buffer and blit the particles onto it
+        self._back_buffer.clear()
+
+        alive = slice(0, self.count)
+        cells = np.floor(self._positions[alive]).astype(np.intp)
+
+        self._back_buffer.blitPoints(cells[:, 1], cells[:, 0], self._glyphs[alive])
+
+    def _step(self, dt: float):
+        ''' Updates all the particles by dt milliseconds in one vectorized step '''
+        if self.count == 0: return
+
+        seconds: float = dt / 1000
+        alive = slice(0, self.count)
+
+        positions = self._positions[alive]
+        velocities = self._velocities[alive]
+
+        velocities += (self.gravity.x * seconds, self.gravity.y * seconds)
+        positions += velocities * seconds
+        self._lifetimes[alive] -= dt
+
+        # keep the particles that are alive and on the panel
+        keep = (
+            (self._lifetimes[alive] > 0) &
+            (positions[:, 0] >= 0) & (positions[:, 0] < self.size.x) &
+            (positions[:, 1] >= 0) & (positions[:, 1] < self.size.y)
+        )
+
+        if keep.all(): return
+
+        # compact the living particles to the front of the arrays
+        kept = np.flatnonzero(keep)
+        count = kept.size
+
+        self._positions[:count] = positions[kept]
+        self._velocities[:count] = velocities[kept]
+        self._lifetimes[:count] = self._lifetimes[kept]
+        self._glyphs[:count] = self._glyphs[kept]
+
+        self.count = count
@@ -0,0 +1,38 @@
+from typing import override
+
+from .object import Object
+from .drawing import Drawing
+
+from ..metrics.vec2 import Vec2
+from ..systems.profiler import FrameProfiler
+
+
+class ProfilerOverlay(Object):
+    '''
+    Shows the p50/p95/p99 of the phases of a FrameProfiler on the screen
+    - Add it to a game screen like any other object: screen.addObject(ProfilerOverlay(game.profiler))
+    - The text is refreshed every `refresh_frames` frames, lines past `height` are cut off
+    '''
+    WIDTH: int = 48
+
+    def __init__(self, profiler: FrameProfiler, position: Vec2 = Vec2(0, 0), height: int = 12, refresh_frames: int = 30, priority: int = 1000):
+        self.profiler: FrameProfiler = profiler
+        self.height: int = height
+        self.refresh_frames: int = refresh_frames
+
+        drawing = Drawing(tag = 'profiler', drawingStates = [self._text([])])
+
+        super().__init__(tags = ['profiler'], drawing = drawing, position = position, priority = priority, isPersistent = True)
+
+    def _text(self, lines: list[str]) -> str:
+        # pad the text to a fixed size, so the panel never has to resize
+        lines = (lines + [''] * self.height)[:self.height]
+
+        return '\n'.join(line[:self.WIDTH].ljust(self.WIDTH) for line in lines)
+
+    @override
+    def update(self, dt: float = 0, game = None):
+        if self.profiler.frames % self.refresh_frames == 0:
+            self.drawing.replaceState(0, self._text(self.profiler.report()))
+
+        super().update(dt, game)
@@ -5,17 +5,43 @@ from .systems.garbage_collection_system import GarbageCollectionSystem
 from .systems.frame_time_keeper import FrameTimeKeeper
 from .systems.rendering_system import RenderingSystem
 from .systems.collision_system import CollisionSystem
+from .systems.profiler import FrameProfiler
 
-from ._interface import EngineInterface, GameScreenInterface
+from ._interface import EngineInterface, GameScreenInterface, RenderMode
+from .panel.backend import RenderBackend
 
 from .components._interfaces import ColliderInterface
 import psutil
 
+from .utils.debug_log import debug_log
+
+_log = debug_log.channel('engine')
+
 class GameEngine(EngineInterface):
-    def __init__(self, window_width: int, window_height: int, debug_mode: bool, frame_cap: int ):
-        EngineInterface.__init__(self, window_width, window_height, debug_mode, frame_cap)
+    def __init__(self, window_width: int, window_height: int, debug_mode: bool, frame_cap: int, render_mode: RenderMode = RenderMode.PANELS,
+                 tick_rate: int = None, max_ticks_per_frame: int = 5, profiler: FrameProfiler = None, backend: RenderBackend = None):
+        EngineInterface.__init__(self, window_width, window_height, debug_mode, frame_cap, render_mode, backend)
         
         if not self.debug_mode: self.init() # initialize engine resources
+
+        ''' FIXED TIMESTEP '''
+        self.tick_rate: int = tick_rate
+        ''' Ticks per second the effects, updates and collisions run at, None runs them once per frame with the frame's dt '''
+
+        self.max_ticks_per_frame: int = max_ticks_per_frame
+        ''' The most ticks a frame can run to catch up, the simulation time past it is dropped '''
+
+        self.interpolation_alpha: float = 0
+        '''
+        How far, 0 to 1, the frame is between the last tick and the next, when tick_rate is set
+        - Only exposed, the engine renders the objects where the last tick left them and doesn't interpolate
+        '''
+
+        self.dropped_ticks: int = 0
+        ''' The number of ticks dropped to keep slow frames from falling further behind '''
+
+        # simulation time, milliseconds, not yet run by a tick
+        self._accumulator: float = 0
         
         self.process = psutil.Process()
         
@@ -28,11 +54,14 @@ class GameEngine(EngineInterface):
 
 
         ''' OBJECT SYSTEMS'''
-        self.rendering_system: RenderingSystem = RenderingSystem()
+        self.rendering_system: RenderingSystem = RenderingSystem(render_mode)
         ''' To handle rendering the objects, we will need to run the rendering system on individual objects '''
 
         self.collision_system: CollisionSystem = CollisionSystem()
-        ''' To handle collisions, we will need to run the collision system on individual objects '''
+        ''' To handle collisions, we will need to run the collision system on all the collidable objects at once '''
+
+        self.profiler: FrameProfiler = profiler
+        ''' Times the phases of every frame if given, e.g GameEngine(..., profiler = FrameProfiler(per_class = True)) '''
 
         
         self.game_screen: GameScreenInterface = None
@@ -60,25 +89,64 @@ class GameEngine(EngineInterface):
                 time.sleep(1)
                 print()
                 print('================= FRAME ===========================')
-                print(f'FPS: {self.frame_time_keeper.fps} | DT: {self.frame_time_keeper.delta_time}ms')
-                print(f'OBJECTS: {len(self.game_screen.objects)}')
+                print(f'FPS: {self.frame_time_keeper.fps} | DT: {self.frame_time_keeper.delta_time}ms | MISSED FRAMES: {self.frame_time_keeper.missed_frames}')
+                print(f'OBJECTS: {len(self.game_screen.objects)} | GARBAGE COLLECTED: {self.garbage_collector.collected}')
+                print(f'BYTES FLUSHED: {self.rendering_system.frame_bytes}')
                 print(f'MEMORY USAGE: {self.get_memory_usage()} MB')
 
+            profiler = self.profiler
+
+            if profiler is not None: start = profiler.begin_frame()
+
             # run delta time keeper
             self.frame_time_keeper.run(self)
 
+            # queue the keys pressed since the last frame
+            self.read_input()
+
+            if profiler is not None: start = profiler.add('frame keeper', start)
+
             # run garbage collector
             self.garbage_collector.run(self)
 
+            if profiler is not None: start = profiler.add('garbage collector', start)
+
             # get delta_time: milliseconds
             dt: float = self.frame_time_keeper.delta_time
-            
-            # run EngineEffects of the game_screen from the engine
-            for effect in self.game_screen.screen_effects:
-                if effect.shouldRun(dt): effect.run(dt, self, None)
 
-            # UPDATE and RENDER GAME_SCREEN OBJECTS
-            for object in self.rendering_system.with_priority(self.game_screen.objects):
+            # UPDATE GAME_SCREEN OBJECTS
+            # once with the frame's dt, or at the fixed tick rate
+            ticks: int = self._tick(dt) if self.tick_rate is None else self._run_fixed_ticks(dt)
+
+            # RENDER GAME_SCREEN OBJECTS
+            # at most once per frame, skipped if no tick has changed the game
+            if ticks > 0: self._render()
+
+            if profiler is not None: profiler.end_frame()
+        
+        self.dispose() # release engine resources
+
+    def _tick(self, dt: float) -> int:
+        '''
+        Runs one step of the simulation
+        - Runs the effects, updates and collisions of the game_screen and its objects
+        '''
+        profiler = self.profiler
+
+        if profiler is not None: start = profiler.now()
+
+        # give the tick its key
+        self.next_key()
+
+        # run EngineEffects of the game_screen from the engine
+        for effect in self.game_screen.screen_effects:
+            if effect.shouldRun(dt): effect.run(dt, self, None)
+
+        if profiler is not None: start = profiler.add('screen effects', start)
+
+        if profiler is not None and profiler.per_class: start = self._update_objects_per_class(dt, profiler, start)
+        else:
+            for object in self.rendering_system.in_order(self.game_screen):
 
                 # run object effects
                 for effect in object.effects:
@@ -87,20 +155,86 @@ class GameEngine(EngineInterface):
                 # Update Screen Objects
                 object.update(dt = dt, game = self)
 
-                 # handle collisions if object has a collider
-                if isinstance(object, ColliderInterface): self.collision_system.run(object, self)
+            if profiler is not None: start = profiler.add('objects', start)
 
-                self.rendering_system.run(object, self) # render the object to screen 
+        # handle collisions of the objects that have a collider
+        self.collision_system.run_all(self)
 
-            # CALL GAME_SCREEN UPDATE FUNCTION
-            self.game_screen.update(dt)      
-        
-        self.dispose() # release engine resources
+        if profiler is not None: start = profiler.add('collision', start)
+
+        # CALL GAME_SCREEN UPDATE FUNCTION
+        self.game_screen.update(dt)
+
+        if profiler is not None: profiler.add('screen update', start)
+
+        return 1
+
+    def _update_objects_per_class(self, dt: float, profiler: FrameProfiler, start: int) -> int:
+        '''
+        Runs the effects and updates of the objects like _tick, timing both on every object for the profiler's per class times
+        - Returns the time they ended
+        '''
+        for object in self.rendering_system.in_order(self.game_screen):
+            for effect in object.effects:
+                if effect.shouldRun(dt): effect.run(dt, self, object)
+
+            start = profiler.add('effects', start, object)
+
+            object.update(dt = dt, game = self)
+
+            start = profiler.add('update', start, object)
+
+        return start
+
+    def _run_fixed_ticks(self, dt: float) -> int:
+        '''
+        Runs as many ticks of 1/tick_rate as the time past allows
+        - The time left over is carried to the next frame
+        - Runs at most max_ticks_per_frame ticks, the time past them is dropped 
+          so a slow frame doesn't make the next frames slower (spiral of death)
+        - Returns the number of ticks run
+        '''
+        # get the fixed dt of a tick, milliseconds
+        tick_dt: float = 1000 / self.tick_rate
+
+        self._accumulator += dt
+
+        ticks: int = 0
+
+        while self._accumulator >= tick_dt:
+            # drop the ticks that can't be caught up on in this frame
+            if ticks == self.max_ticks_per_frame:
+                self.dropped_ticks += int(self._accumulator // tick_dt)
+                self._accumulator %= tick_dt
+                break
+
+            self._tick(tick_dt)
+
+            self._accumulator -= tick_dt
+            ticks += 1
+
+        self.interpolation_alpha = self._accumulator / tick_dt
+
+        return ticks
+
+    def _render(self):
+        ''' Renders the objects of the game_screen in order of priority and writes the frame to the screen '''
+        if self.profiler is not None: start = self.profiler.now()
+
+        for object in self.rendering_system.in_order(self.game_screen):
+            self.rendering_system.run(object, self) # render the object to screen 
+
+        # write the rendered frame to the screen
+        self.rendering_system.flush(self)
+
+        if self.profiler is not None: self.profiler.add('render', start)
 
 
 class Game(GameEngine, GameScreenInterface):
-    def __init__(self, width: int = 50, height: int = 50, debug_mode: bool = False, frame_cap:int = 900):
-        super().__init__(width, height, debug_mode=debug_mode, frame_cap=frame_cap)
+    def __init__(self, width: int = 50, height: int = 50, debug_mode: bool = False, frame_cap:int = 900, render_mode: RenderMode = RenderMode.PANELS,
+                 tick_rate: int = None, max_ticks_per_frame: int = 5, profiler: FrameProfiler = None, backend: RenderBackend = None):
+        super().__init__(width, height, debug_mode=debug_mode, frame_cap=frame_cap, render_mode=render_mode,
+                         tick_rate=tick_rate, max_ticks_per_frame=max_ticks_per_frame, profiler=profiler, backend=backend)
         GameScreenInterface.__init__(self)
 
         self.game_screens: list[GameScreen] = []
@@ -113,7 +247,7 @@ class Game(GameEngine, GameScreenInterface):
         self.onCreate()
 
     def onLaunch(self):
-        print(f'screens 0nLaunxch {self.game_screens}')
+        if _log.debug_on: _log.debug(f'screens 0nLaunxch {self.game_screens}')
 
     def run(self):
         self.onLaunch()
@@ -128,7 +262,7 @@ class Game(GameEngine, GameScreenInterface):
         if len(self.game_screens) == 0: 
             self.game_screen = self
         else:
-            print(f'screens 0ncreate2 {self.game_screens}')
+            if _log.debug_on: _log.debug(f'screens 0ncreate2 {self.game_screens}')
             # switch to the first screen
             self.switchToScreenByTag(self.game_screens[0].tag)
 
@@ -148,7 +282,7 @@ class Game(GameEngine, GameScreenInterface):
         screen.onCreate()
 
     def switchToScreenByTag(self, tag:str):
-        print(f'switching to {self.game_screens}')
+        if _log.debug_on: _log.debug(f'switching to {self.game_screens}')
         # find next screen with tag
         scrs = self.find_screen_by_tag(tag)
 
@@ -6,6 +6,7 @@ from .._interface import EngineInterface
 from ..components._interfaces import ObjectInterface
 
 from ..metrics.duration import Duration
+from ..utils.validation import STRICT_VALIDATION
 
 
 class RepeatType(Enum):
@@ -29,14 +30,14 @@ class RepeatEffect(Effect):
     def __init__(self, repeatType, duration):
         # the RepeatType of the effect
         # vaildate 
-        if not isinstance(repeatType, RepeatType):
+        if STRICT_VALIDATION and not isinstance(repeatType, RepeatType):
             raise TypeError(f'repeatType arg should be of type RepeatType, {type(duration)} given')
         
         self.repeatType: RepeatType = repeatType
 
         # the duration it should wait before callback
         # validate
-        if not isinstance(duration, Duration):
+        if STRICT_VALIDATION and not isinstance(duration, Duration):
             raise TypeError(f'duration should of type Duration, {type(duration)} given')
         
         self.duration: Duration = duration
@@ -55,7 +56,9 @@ class RepeatEffect(Effect):
         super().__init__()
 
     def run(self, dt:float, game: EngineInterface, object: 'ObjectInterface|None'):
-        # validate the arguments
+        # validate the arguments, every frame, in ValidationMode.STRICT only
+        if not STRICT_VALIDATION: return
+
         if not isinstance(dt, float):
             raise TypeError("dt must be of type float is type " + str(type(dt)))
         
@@ -1,10 +1,18 @@
 from .vec2 import Vec2
 
+from ..utils.listeners import Listeners
+
 class Bounds:
     ''' Holds the bounds of an object '''
-    def __init__(self, size: Vec2, pos: Vec2):
+    def __init__(self, size: Vec2, pos: Vec2, owner = None):
         self._size = size
         self._pos = pos
+
+        self.owner = owner
+        ''' The object the bounds belong to, the listeners are called with it, or with the bounds if it has none '''
+
+        self.listeners: Listeners = Listeners()
+        ''' Called when the bounds move or resize '''
         
         self._define_bounds() # define bounds
 
@@ -51,7 +59,14 @@ class Bounds:
         ''' Returns the bottom right corner of the bounds '''
         return Vec2(self._pos.x + self._size.x + 1, self._pos.y + self._size.y + 1)
 
+    @property
+    def extents(self) -> tuple[int, int, int, int]:
+        ''' Returns (x_start, x_end, y_start, y_end) of the bounds '''
+        return (self.x_start, self.x_end, self.y_start, self.y_end)
+
     def _define_bounds(self):
+        previous_extents = self.extents if self.listeners else None
+
         # where the object's width extent starts on the screen
         self.x_start = self._pos.x
          # where the object's width extent ends on the screen
@@ -60,7 +75,18 @@ class Bounds:
         self.y_start = self._pos.y
         # where the object's height extent ends on the screen
         self.y_end = self._pos.y + self._size.y + 1
-        
+
+        # let the listeners know if the bounds moved or resized
+        if self.listeners and previous_extents != self.extents:
+            self.listeners.notify(self if self.owner is None else self.owner)
+
+    def refresh(self):
+        '''
+        Redefines the bounds from the current values of its pos and size
+        - Needed after pos or size are changed in place, e.g pos.x += 1
+        '''
+        self._define_bounds()
+
     def is_within(self, other: 'Bounds'):
         ''' Return if this bounds is within the other '''
         # or
@@ -1,6 +1,8 @@
 
 from enum import Enum
 
+from ..utils.validation import STRICT_VALIDATION
+
 class DurationMetrics(Enum):
     '''
     Defines the metrics or Units for the time duration
@@ -21,14 +23,15 @@ class Duration:
         - metrics (DurationMetrics): The metrics of the duration
         - duration (int): The duration of the time
         '''
-        # validate arguments
-        # metrics should be of type DurationMetrics
-        if not isinstance(metrics, DurationMetrics):
-            raise TypeError("metrics must be of type DurationMetrics")
-        
-        # duration should be of type int
-        if not isinstance(duration, int):
-            raise TypeError("duration must be of type int")
+        # validate arguments, in ValidationMode.STRICT only
+        if STRICT_VALIDATION:
+            # metrics should be of type DurationMetrics
+            if not isinstance(metrics, DurationMetrics):
+                raise TypeError("metrics must be of type DurationMetrics")
+            
+            # duration should be of type int
+            if not isinstance(duration, int):
+                raise TypeError("duration must be of type int")
         
         # set properties
         self._metrics: DurationMetrics = metrics
@@ -89,7 +92,8 @@ class Duration:
         '''
         # validate arguments
         # metric should be of type DurationMetrics
-        if not isinstance(metric, DurationMetrics):
+        # checked on every milliSeconds read of RepeatEffect.shouldRun, in ValidationMode.STRICT only
+        if STRICT_VALIDATION and not isinstance(metric, DurationMetrics):
             raise TypeError("other must be of type DurationMetrics")
 
         # if the metrics are the same, return the duration
@@ -189,7 +193,7 @@ class Duration:
         '''
         # validate arguments
         # other should be of type Duration
-        if not isinstance(other, Duration):
+        if STRICT_VALIDATION and not isinstance(other, Duration):
             raise TypeError("other must be of type Duration")
         
         # metrics should be the same
@@ -1,6 +1,3 @@
-from dataclasses import dataclass, field
-
-@dataclass
 class Vec2:
     '''
     ### A 2D vector with x and y
@@ -9,9 +6,18 @@ class Vec2:
     Fields:
     - x(int)
     - y(int)
+
+    - Uses __slots__ so vectors are small and cheap to create
+    - += and -= change the vector in place, +, - and the rest return a new vector
     '''
-    _x: int = field(default=0)
-    _y: int = field(default=0)
+    __slots__ = ('_x', '_y')
+
+    # vectors are changed in place, so they can't be hashed
+    __hash__ = None
+
+    def __init__(self, _x: int = 0, _y: int = 0):
+        self._x = _x
+        self._y = _y
 
     '''
     Property getter and setter for x and y
@@ -23,9 +29,7 @@ class Vec2:
     @x.setter
     def x(self, x: int):
         # validate the inputted x value
-        x = self._validate_value(x)
-
-        self._x = x
+        self._x = x if type(x) is int else int(x)
 
     @property
     def y(self) -> int:
@@ -34,14 +38,12 @@ class Vec2:
     @y.setter
     def y(self, y: int):
         # validate the inputted y value
-        y = self._validate_value(y)
-
-        self._y = y
+        self._y = y if type(y) is int else int(y)
 
 
     def _validate_value(self, value: int) -> int:
         # convert to int if it is not an int
-        return int(value) if value is not int else value
+        return value if type(value) is int else int(value)
     
     def replace_with(self, other: 'Vec2') -> 'Vec2':
         '''
@@ -55,6 +57,7 @@ class Vec2:
 
     '''
     Mathematical operations for vec2
+    - Other vectors are read through _x and _y, skipping the properties
     '''
     def __add__(self, other):
         '''
@@ -63,35 +66,62 @@ class Vec2:
         - b = Vec2(3, 4)
         - a + b => Vec(4, 6)
         '''
-        return Vec2(self.x + other.x, self.y + other.y)
+        if other.__class__ is Vec2: return Vec2(self._x + other._x, self._y + other._y)
+
+        return Vec2(self._x + other.x, self._y + other.y)
     
     def __sub__(self, other):
         ''' Substract two vectors '''
-        return Vec2(self.x - other.x, self.y - other.y)
+        if other.__class__ is Vec2: return Vec2(self._x - other._x, self._y - other._y)
+
+        return Vec2(self._x - other.x, self._y - other.y)
+
+    def __iadd__(self, other):
+        ''' Add another vector to this vector, in place '''
+        if other.__class__ is Vec2:
+            self._x += other._x
+            self._y += other._y
+        else:
+            self._x += other.x
+            self._y += other.y
+
+        return self
+
+    def __isub__(self, other):
+        ''' Substract another vector from this vector, in place '''
+        if other.__class__ is Vec2:
+            self._x -= other._x
+            self._y -= other._y
+        else:
+            self._x -= other.x
+            self._y -= other.y
+
+        return self
     
     def __mul__(self, other):
         ''' Multiply two vectors '''
-        return Vec2(self.x * other, self.y * other)
+        return Vec2(self._x * other, self._y * other)
     
     def __truediv__(self, other):
-        return Vec2(self.x / other, self.y / other)
+        return Vec2(self._x / other, self._y / other)
     
     def __eq__(self, other):
         ''' Equate two vectors '''
-        return self.x == other.x and self.y == other.y
+        if other.__class__ is Vec2: return self._x == other._x and self._y == other._y
+
+        return self._x == other.x and self._y == other.y
     
     def __repr__(self):
         ''' Print the vector '''
-        return f"Vec2({self.x}, {self.y})"
+        return f"Vec2({self._x}, {self._y})"
     
     def __str__(self):
         ''' Print the vector '''
-        return f"({self.x}, {self.y})"
+        return f"({self._x}, {self._y})"
     
     def __neg__(self):
         '''  Negate the vector '''
-        return Vec2(-self.x, -self.y)
+        return Vec2(-self._x, -self._y)
     
     def __abs__(self):
-        return Vec2(abs(self.x), abs(self.y))
-    
\ No newline at end of file
+        return Vec2(abs(self._x), abs(self._y))
@@ -5,6 +5,8 @@ from .frame_buffer import FrameBuffer
 from ..metrics.bounds import Bounds
 from ..metrics.vec2 import Vec2
 
+from ..utils.listeners import Listeners
+
 class PanelInterface(ABC):
     '''
         Defines the interface for a panel object
@@ -15,8 +17,9 @@ class PanelInterface(ABC):
         ''' position on the screen: Vec2'''
         self.size: Vec2 = None
         ''' Size of the panel: Vec2'''
-        self.priority: int = None
-        ''' Priority of the panel: int'''
+        self._priority: int = None
+        self.priority_listeners: Listeners = Listeners()
+        ''' Called with the panel whenever its priority changes '''
         self.bounds: Bounds = None
         ''' Bounds of the panel: Bounds'''
 
@@ -30,6 +33,20 @@ class PanelInterface(ABC):
 
         # Uses double buffering to render the frames
 
+    @property
+    def priority(self) -> int:
+        ''' Priority of the panel: int'''
+        return self._priority
+
+    @priority.setter
+    def priority(self, priority: int):
+        # only notify the listeners if the priority changed
+        if priority == self._priority: return
+
+        self._priority = priority
+
+        if self.priority_listeners: self.priority_listeners.notify(self)
+
     ''' MUST HAVE THE FOLLOWING INSTRUCTIONS'''
     ''' Should Have Update'''
     @abstractmethod
@@ -0,0 +1,180 @@
+from abc import ABC, abstractmethod
+from collections import deque
+import curses
+import curses.panel
+import os
+
+from .frame_buffer import FrameBuffer
+from .pixels import BLANK_PIXEL, to_pixels
+
+from ..metrics.vec2 import Vec2
+
+
+class RenderBackend(ABC):
+    '''
+    Defines where the engine renders its frames
+    - The Compositor writes the changed spans of every frame with write() and ends the frame with flush()
+    - Only backends that support panel windows can render in RenderMode.PANELS,
+      the engine composites the frames for the rest
+    '''
+    supports_panel_windows: bool = False
+    ''' True if objects can create curses panel windows on the backend '''
+
+    interactive: bool = False
+    ''' True if the backend is a terminal a player sees and hears, sound is only initialized for it '''
+
+    @property
+    @abstractmethod
+    def ready(self) -> bool:
+        ''' True once the backend has been initialized and can be written to '''
+
+    @abstractmethod
+    def init(self, engine) -> None:
+        ''' Starts the backend for the engine's window '''
+
+    def dispose(self) -> None:
+        ''' Releases the backend's resources '''
+
+    @abstractmethod
+    def write(self, y: int, x: int, pixels: str) -> None:
+        ''' Writes a span of pixels at row y, column x '''
+
+    @abstractmethod
+    def flush(self) -> None:
+        ''' Ends the frame, showing everything written on it '''
+
+    @abstractmethod
+    def clear(self) -> None:
+        ''' Blanks the whole screen '''
+
+    def read_key(self) -> int:
+        ''' Returns the next key pressed without waiting, -1 if there is none '''
+        return -1
+
+
+class CursesBackend(RenderBackend):
+    '''
+    Renders to the terminal with curses
+    - Supports panel windows, so objects can render in RenderMode.PANELS
+    '''
+    supports_panel_windows: bool = True
+    interactive: bool = True
+
+    def __init__(self):
+        self.stdscr = None
+        ''' The curses screen, None until init '''
+
+    @property
+    def ready(self) -> bool:
+        return self.stdscr is not None
+
+    def init(self, engine) -> None:
+        # initialize curses
+        self.stdscr = curses.initscr()
+        self.stdscr.box()
+
+        curses.curs_set(0)  # Hide cursor
+        curses.noecho()  # Don't echo keystrokes
+
+        self.stdscr.nodelay(True) # avoid waiting for key presses
+        self.stdscr.keypad(True) # read arrow and function keys as single keys
+
+        # resize the cli window
+        window_confid_command: str = f'mode con: cols={engine.window_width} lines={engine.window_height}'
+        os.system(window_confid_command)
+
+    def write(self, y: int, x: int, pixels: str) -> None:
+        try:
+            self.stdscr.addstr(y, x, pixels)
+        except curses.error:
+            # writing to the bottom right cell of the screen moves the cursor off the screen
+            # the pixel is still drawn
+            pass
+
+    def flush(self) -> None:
+        # stage the screen and the panel windows, then update the terminal once
+        self.stdscr.noutrefresh()
+        curses.panel.update_panels()
+        curses.doupdate()
+
+    def clear(self) -> None:
+        self.stdscr.clear()
+        self.stdscr.refresh()
+
+    def read_key(self) -> int:
+        return self.stdscr.getch()
+
+
+class HeadlessBackend(RenderBackend):
+    '''
+    Renders to an in-memory FrameBuffer, for tests, benchmarks and simulation servers without a TTY
+    - Counts the writes and bytes written, and the frames flushed
+    - snapshot() gives the screen as text, with keep_snapshots the snapshots of the last frames are kept too
+    - press() queues keys, they are read one per frame as if typed on a terminal
+    '''
+    def __init__(self, keep_snapshots: int = 0):
+        self.screen: FrameBuffer = None
+        ''' The in-memory screen, created with the size of the engine's window on init '''
+
+        self.writes: int = 0
+        ''' The number of spans written '''
+
+        self.bytes_written: int = 0
+        ''' The bytes of pixels written '''
+
+        self.frames: int = 0
+        ''' The number of frames flushed '''
+
+        self.keep_snapshots: int = keep_snapshots
+        ''' The number of frames to keep snapshots of '''
+
+        self.snapshots: list[str] = []
+        ''' The snapshots of the last keep_snapshots frames, oldest first '''
+
+        # the keys pressed and not read yet
+        self._keys: deque[int] = deque()
+
+    @property
+    def ready(self) -> bool:
+        return self.screen is not None
+
+    def init(self, engine) -> None:
+        self.screen = FrameBuffer(size = Vec2(engine.window_width, engine.window_height))
+
+    def write(self, y: int, x: int, pixels: str) -> None:
+        # clip the span to the screen
+        if y < 0 or y >= self.screen.size.y or x >= self.screen.size.x: return
+
+        span = to_pixels(pixels)[:self.screen.size.x - x]
+
+        self.screen.buffer[y, x:x + span.size] = span
+
+        self.writes += 1
+        self.bytes_written += len(pixels.encode())
+
+    def flush(self) -> None:
+        self.frames += 1
+
+        if self.keep_snapshots:
+            self.snapshots.append(self.snapshot())
+            del self.snapshots[:-self.keep_snapshots]
+
+    def clear(self) -> None:
+        self.screen.buffer[...] = BLANK_PIXEL
+
+    def read_key(self) -> int:
+        return self._keys.popleft() if self._keys else -1
+
+    def press(self, *keys: 'int|str') -> None:
+        ''' Queues keys to be read, e.g backend.press('a', curses.KEY_UP) '''
+        self._keys.extend(ord(key) if isinstance(key, str) else key for key in keys)
+
+    def snapshot(self) -> str:
+        ''' Returns the screen as text, rows joined by newlines '''
+        return self.screen.in_pixels()
+
+    def reset_counts(self) -> None:
+        ''' Zeroes the counts of writes, bytes and frames '''
+        self.writes = 0
+        self.bytes_written = 0
+        self.frames = 0
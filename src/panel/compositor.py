@@ -0,0 +1,59 @@
+from .frame_buffer import FrameBuffer
+from ._interfaces import PanelInterface
+
+from ..metrics.vec2 import Vec2
+
+
+class Compositor:
+    '''
+    Composites the panels of all the objects onto one screen sized frame buffer
+    - Used by the RenderingSystem in RenderMode.COMPOSITED
+    - Panels are composited in the order they are given, later panels are drawn over earlier ones
+    - Only the pixels drawings have put on a panel are composited, so blanks let lower panels show through
+    - Once per frame, only the spans of the screen that changed are written to the curses screen
+    '''
+    def __init__(self, size: Vec2):
+        self.size: Vec2 = Vec2(size.x, size.y)
+
+        # back buffer is composited during the frame
+        self._back_buffer: FrameBuffer = FrameBuffer(size = self.size)
+
+        # front buffer holds what is on the screen
+        self._front_buffer: FrameBuffer = FrameBuffer(size = self.size)
+
+    def compose(self, panel: PanelInterface) -> None:
+        ''' Composites the current frame of the panel onto the screen at the panel's position '''
+        panel.compositeOnto(self._back_buffer)
+
+    def present(self, backend) -> int:
+        '''
+        Writes the spans of the composited frame that changed to the RenderBackend
+        - Nothing is written if the backend isn't ready, e.g in debug mode
+        - Clears the back buffer for the next frame
+        - Returns the bytes of pixels written to the screen
+        '''
+        written_bytes: int = 0
+
+        # get the spans of the screen that changed since the last frame
+        changed_spans = self._back_buffer.changedSpans(self._front_buffer)
+
+        # push the changed spans to the front buffer
+        self._front_buffer.copySpans(self._back_buffer, changed_spans)
+        self._back_buffer.markClean()
+
+        if backend.ready:
+            for y, x_start, x_end in changed_spans:
+                pixels: str = self._front_buffer.spanInPixels(y, x_start, x_end)
+
+                backend.write(y, x_start, pixels)
+
+                written_bytes += len(pixels.encode())
+
+        # start the next frame from a blank screen
+        self._back_buffer.clear()
+
+        return written_bytes
+
+    def invalidate(self) -> None:
+        ''' Forgets what is on the screen, e.g after it was cleared, so the next frame is written in full '''
+        self._front_buffer.clear()
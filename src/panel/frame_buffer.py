@@ -1,10 +1,16 @@
 from dataclasses import dataclass, field
 import numpy as np
 
-from ..components.drawing import Drawing, DrawingStack
+from ..components.drawing import Drawing, DrawingStack, StateRaster
 
 from ..metrics.vec2 import Vec2
 
+from .pixels import BLANK_PIXEL, PIXEL_DTYPE, to_string
+
+from ..utils.debug_log import debug_log
+
+_log = debug_log.channel('render')
+
 
 @dataclass
 class FrameBuffer:
@@ -19,73 +25,112 @@ class FrameBuffer:
     '''
     size: Vec2 = field(default_factory=Vec2())
 
-    _buffer: list[list[str]] = field(init=False, default_factory = list[list])
+    _buffer: np.ndarray = field(init=False, default = None)
+    ''' Preallocated 2D array of pixels, rows by columns '''
+
+    _opaque: np.ndarray = field(init=False, default = None)
+    ''' 2D bool array, True where a drawing has put a pixel since the last clear '''
+
+    _touched: dict[int, tuple[int, int]] = field(init=False, default_factory = dict)
+    ''' Rows and column spans written to since the last clear: {row: (x_start, x_end)} '''
+
+    _dirty: dict[int, tuple[int, int]] = field(init=False, default_factory = dict)
+    ''' Rows and column spans that may differ from the last frame pushed to the screen '''
+
+    def __post_init__(self):
+        self._buffer = self._createEmptyBuffer()
+        self._opaque = np.zeros((self.size.y, self.size.x), dtype = bool)
 
     ''' SETTERS AND GETTERS FOR PROPERTIES '''
     @property
-    def buffer(self) -> str:
+    def buffer(self) -> np.ndarray:
         return self._buffer
     
     @buffer.setter
-    def buffer(self, buffer: list[list[str]]):
+    def buffer(self, buffer: np.ndarray):
         # validate input
-        if not isinstance(buffer, list[list[str]]):
-            raise TypeError("Buffer must be of type list[list[str]]")
+        if not isinstance(buffer, np.ndarray) or buffer.shape != self._buffer.shape:
+            raise TypeError(f"Buffer must be a numpy array of shape {self._buffer.shape}")
         
-        self._buffer = buffer
+        np.copyto(self._buffer, buffer)
+
+        # the whole buffer could have changed
+        for y in range(self.size.y): self._markDirty(y, 0, self.size.x)
 
     
-    def _addLinesToBuffer(self, lines: list[str], pos: Vec2) -> None:
+    def _blitRaster(self, raster: StateRaster, pos: Vec2, tag: str = '') -> None:
         '''
-        Adds the lines, a list of strings, to the frame buffer according to its the local position
+        Blits a pre-rasterized drawing state into the frame buffer at its local position
+        - The glyphs are copied into the buffer with one slice assignment
+        - Cells outside the mask of the raster are left untouched
         '''
-        # print('======ADDING LINES TO BUFFER======')
-        # print('LINES BEING ADDED TO BUFFER', lines)
-        # print(f'BUFFER BEFORE ADDING LINES: {self._buffer}')
-        # iterate through the lines
-        for i in range(len(lines)):
-            line: str = lines[i]
-            # print(f'LINE BEING ADDED TO BUFFER [{line}]')
+        height, width = raster.glyphs.shape
+
+        if pos.y + height > self.size.y:
+            raise IndexError(
+                f'''
+                    ERROR:
+                        While Adding Drawing =>{tag}<= to Buffer
+                        LOCAL POS [{pos.y + height - 1}], is trys to occupy, IS OUTSIDE LOCAL BUFFER"S BOUNDS [{self.size.y}]
+                '''
+            )
 
-            # get the position of the line
-            # the first line starts at top left
-            # the next below it
-            line_pos: Vec2 = Vec2(pos.x, pos.y + i)
+        # clip the raster to the width of the buffer
+        x_end: int = min(pos.x + width, self.size.x)
 
-            try:
-                # get the line in _buffer that the newline updates
-                buffer_line_chars: list[str] = self._buffer[line_pos.y]
-            except IndexError:
-                print(f'ERROR: ')
-                print(f'While Adding the {i}th Line =>{line}<= to Buffer')
-                print(f'LOCAL POS [{line_pos.y}], is trys to occupy, IS OUTSIDE LOCAL BUFFER"S BOUNDS [{self.size.y}]')
-                print(f'')
-                raise IndexError(
-                    f'''
-                        ERROR:
-                            While Adding the {i}th Line =>{line}<= to Buffer
-                            LOCAL POS [{line_pos.y}], is trys to occupy, IS OUTSIDE LOCAL BUFFER"S BOUNDS [{self.size.y}]
-                    '''
-                )
+        if x_end <= pos.x: return
 
-            # update the line_chars/line_pixels
-            first_part = np.array(buffer_line_chars[0:line_pos.x])
-            second_part = np.array([*line])
-            third_part = np.array([])
+        target = self._buffer[pos.y:pos.y + height, pos.x:x_end]
+        opaque = self._opaque[pos.y:pos.y + height, pos.x:x_end]
+
+        if raster.opaque:
+            target[...] = raster.glyphs[:, :x_end - pos.x]
+            opaque[...] = True
+        else:
+            np.copyto(target, raster.glyphs[:, :x_end - pos.x], where = raster.mask[:, :x_end - pos.x])
+            opaque |= raster.mask[:, :x_end - pos.x]
 
-            # if the line to add did not reach the end
-            if not ((line_pos.x + len(line)) >= len(buffer_line_chars)):
-                third_part = np.array(buffer_line_chars[line_pos.x + len(line):])
+        # record the spans the raster occupies as dirty
+        for y in range(pos.y, pos.y + height): self._markDirty(y, pos.x, x_end)
+
+    def blitPoints(self, ys: np.ndarray, xs: np.ndarray, glyphs: np.ndarray) -> None:
+        '''
+        Blits single pixels, e.g particles, into the frame buffer in one step
+        - ys, xs and glyphs are arrays of the same length, the points outside the buffer are clipped
+        - Later points are drawn over earlier ones on the same cell
+        '''
+        inside = (xs >= 0) & (xs < self.size.x) & (ys >= 0) & (ys < self.size.y)
 
-            # print('NEW LINE', new_line)
+        ys, xs, glyphs = ys[inside], xs[inside], glyphs[inside]
 
-            self._buffer[line_pos.y] = np.concatenate((first_part, second_part, third_part))
+        if not ys.size: return
 
-            # print('NEW LINE', self._buffer[line_pos.y])
+        self._buffer[ys, xs] = glyphs
+        self._opaque[ys, xs] = True
 
-            # print('NEW BUFFER AFER LINE', self._buffer)
+        # record the span of every row the points are on as dirty
+        order = np.argsort(ys, kind = 'stable')
+        rows, starts = np.unique(ys[order], return_index = True)
 
+        x_starts = np.minimum.reduceat(xs[order], starts)
+        x_ends = np.maximum.reduceat(xs[order], starts) + 1
 
+        for y, x_start, x_end in zip(rows.tolist(), x_starts.tolist(), x_ends.tolist()): self._markDirty(y, x_start, x_end)
+
+    def _markDirty(self, y: int, x_start: int, x_end: int) -> None:
+        '''
+        Records the span [x_start, x_end) of row y as written on this frame
+        '''
+        if x_start >= x_end: return
+
+        self._mergeSpan(self._touched, y, x_start, x_end)
+        self._mergeSpan(self._dirty, y, x_start, x_end)
+
+    def _mergeSpan(self, spans: dict[int, tuple[int, int]], y: int, x_start: int, x_end: int) -> None:
+        ''' Adds the span to spans, spans on the same row are merged into one span covering both '''
+        span = spans.get(y)
+
+        spans[y] = (x_start, x_end) if span is None else (min(span[0], x_start), max(span[1], x_end))
 
     def _validateDrawingInBounds(self, drawing: Drawing) -> None:
         '''
@@ -108,11 +153,12 @@ class FrameBuffer:
             raise ValueError(f"Drawing  {drawing.tag} is trying to occupy space {drawing_space_width, drawing_space_height} outside its panel's bounds ({self.size.x}, {self.size.y})")
 
 
-    def manipulateBufferWithDrawing(self, drawing) -> None:
+    def manipulateBufferWithDrawing(self, drawing, transparentChar: str = None) -> None:
         '''
         Manipulates the buffer with the given drawing.
         - Adds the lines of the drawing to the frame buffer 
             according to the local position of the drawing
+        - The drawings of a DrawingStack are blitted with the stack's transparentChar
         '''
         # print()
         # print(f'DRAWING HEIGHT {self.size.y}')
@@ -120,10 +166,12 @@ class FrameBuffer:
 
         # if drawing is of the DrawingStack class
         if (isinstance(drawing, DrawingStack)):
-            print('MANIPULATING BUFFER WITH DRAWING STACK: ', drawing.tag)
+            if _log.debug_on: _log.debug(f'MANIPULATING BUFFER WITH DRAWING STACK: {drawing.tag}')
             # recall this function for all the drawings
+            stack_transparent_char = drawing.transparentChar
+
             for drawing in drawing.drawings: 
-                self.manipulateBufferWithDrawing(drawing)
+                self.manipulateBufferWithDrawing(drawing, stack_transparent_char)
 
         # if drawing is of the Drawing class
         elif (isinstance(drawing, Drawing)):
@@ -132,32 +180,101 @@ class FrameBuffer:
             # validate drawing is in panel bounds
             self._validateDrawingInBounds(drawing)
 
-            # get the current state of the drawing and add it to frame buffer
+            # get the rasterized current state of the drawing and add it to frame buffer
             # according to local_position of the drawing
             # print('MANIPUATING BUFFER WITH DRAWING: ', drawing.tag)
             # print('CURRENT STATE; ', drawing.get_current_state())
-            self._addLinesToBuffer(drawing.get_current_state(), drawing.local_pos)
+            self._blitRaster(drawing.get_current_raster(transparentChar), drawing.local_pos, drawing.tag)
         
         else:
             raise TypeError("drawing must be of type Drawing or DrawingStack")
         
 
+    def composite(self, other: 'FrameBuffer', pos: Vec2) -> None:
+        '''
+        Blits the pixels other's drawings have put, onto this frame buffer at pos
+        - Used to composite the frame buffers of panels onto a screen sized frame buffer
+        - The parts of other that fall outside this frame buffer are clipped
+        - Blank cells no drawing has put a pixel on are left untouched
+        '''
+        # get the region of this buffer that other covers
+        x_start: int = max(pos.x, 0)
+        y_start: int = max(pos.y, 0)
+        x_end: int = min(pos.x + other.size.x, self.size.x)
+        y_end: int = min(pos.y + other.size.y, self.size.y)
+
+        if x_start >= x_end or y_start >= y_end: return
+
+        # get the same region in other's coordinates
+        source_rows = slice(y_start - pos.y, y_end - pos.y)
+        source_cols = slice(x_start - pos.x, x_end - pos.x)
+
+        mask = other._opaque[source_rows, source_cols]
+
+        np.copyto(self._buffer[y_start:y_end, x_start:x_end], other._buffer[source_rows, source_cols], where = mask)
+        self._opaque[y_start:y_end, x_start:x_end] |= mask
+
+        # record the spans other covers as dirty
+        for y in range(y_start, y_end): self._markDirty(y, x_start, x_end)
+
     def resize(self, size: Vec2):
         '''
         Resizes the frame buffer
         '''
         self.size = size
 
-        self._emptyBuffer = self._createEmptyBuffer()
+        # reallocate the buffer, nothing has been written to it yet
+        self._buffer = self._createEmptyBuffer()
+        self._opaque = np.zeros((self.size.y, self.size.x), dtype = bool)
+        self._touched = {}
+        self._dirty = {}
 
     def in_pixels(self) -> str: 
         '''
         Converts the buffer pixels to a string
         '''
 
-        return "\n".join("".join(line) for line in self._buffer)
+        return "\n".join(to_string(line) for line in self._buffer)
 
     
+    def spanInPixels(self, y: int, x_start: int, x_end: int) -> str:
+        '''
+        Converts the span [x_start, x_end) of row y to a string
+        '''
+        return to_string(self._buffer[y, x_start:x_end])
+
+    def changedSpans(self, other: 'FrameBuffer') -> list[tuple[int, int, int]]:
+        '''
+        Gives the spans of this frame buffer that differ from the other frame buffer
+        - Only the dirty spans are compared, the rest of the buffer is known to be blank on both
+        - Returns a list of (y, x_start, x_end), each span trimmed to its changed pixels
+        '''
+        changed: list[tuple[int, int, int]] = []
+
+        for y, (x_start, x_end) in self._dirty.items():
+            # get the indices of the pixels that changed in the span
+            diff = np.flatnonzero(self._buffer[y, x_start:x_end] != other._buffer[y, x_start:x_end])
+
+            if diff.size: changed.append((y, x_start + int(diff[0]), x_start + int(diff[-1]) + 1))
+
+        return changed
+
+    def differsFrom(self, other: 'FrameBuffer') -> bool:
+        '''
+        Checks if any of the dirty spans of this frame buffer differ from the other frame buffer
+        - Stops at the first changed span
+        '''
+        for y, (x_start, x_end) in self._dirty.items():
+            if not np.array_equal(self._buffer[y, x_start:x_end], other._buffer[y, x_start:x_end]): return True
+
+        return False
+
+    def markClean(self) -> None:
+        '''
+        Forgets the dirty spans, called once the changes have been pushed to the screen
+        '''
+        self._dirty = {}
+
     def isEqualTo(self, other: 'FrameBuffer') -> bool:
         '''
         Checks if this frame buffer is equal to the other frame buffer
@@ -169,16 +286,43 @@ class FrameBuffer:
         # check if the buffers are equal
         return np.array_equal(self._buffer, other._buffer)
     
-    def _createEmptyBuffer(self) -> list[list[str]]: 
+    def _createEmptyBuffer(self) -> np.ndarray: 
         # print("Creating empty buffer of size ", self.size.x, "x", self.size.y)
-        return np.full((self.size.y, self.size.x), ' ')
+        return np.full((self.size.y, self.size.x), BLANK_PIXEL, dtype = PIXEL_DTYPE)
 
-    def clear(self): self._buffer = self._createEmptyBuffer()
+    def clear(self):
+        '''
+        Blanks the buffer in place
+        - Only the spans written since the last clear are blanked, the rest is already blank
+        '''
+        for y, (x_start, x_end) in self._touched.items():
+            self._buffer[y, x_start:x_end] = BLANK_PIXEL
+            self._opaque[y, x_start:x_end] = False
+
+            # the blanked spans are dirty until they are pushed to the screen
+            self._mergeSpan(self._dirty, y, x_start, x_end)
+
+        self._touched = {}
 
     def copy(self, other: 'FrameBuffer'):
         ''' Changes this fields to other's '''
 
+        if self._buffer.shape == other._buffer.shape:
+            np.copyto(self._buffer, other._buffer)
+            np.copyto(self._opaque, other._opaque)
+        else:
+            self._buffer = other._buffer.copy()
+            self._opaque = other._opaque.copy()
+
         self.size = other.size
 
-        self._buffer = other._buffer
+        self._touched = dict(other._touched)
+
+    def copySpans(self, other: 'FrameBuffer', spans: list[tuple[int, int, int]]):
+        ''' Copies the spans, (y, x_start, x_end), of other's pixels into this buffer '''
+        for y, x_start, x_end in spans:
+            self._buffer[y, x_start:x_end] = other._buffer[y, x_start:x_end]
+            self._opaque[y, x_start:x_end] = other._opaque[y, x_start:x_end]
+
+            self._mergeSpan(self._touched, y, x_start, x_end)
 
@@ -10,6 +10,10 @@ from ..components._interfaces import DrawingInterface, DrawingStackInterface
 from ..metrics.bounds import Bounds
 from ..metrics.vec2 import Vec2
 
+from ..utils.debug_log import debug_log
+
+_log = debug_log.channel('render')
+
 #panel object
 class Panel(PanelInterface):
     '''
@@ -24,11 +28,15 @@ class Panel(PanelInterface):
         
         # set the constraints, position and priority of the panel
         self.size = Vec2(size.x, size.y)
-        self.pos = pos
+        # copy the position, so moving the panel in place never moves the Vec2 it was given
+        self.pos = Vec2(pos.x, pos.y)
         self.priority = priority
 
         self.keys_pressed:list = []
 
+        # the bytes of pixels written to the panel window since the rendering system last counted them
+        self.staged_bytes: int = 0
+
         # create the panel window with constraints
         # self.createPanelWindow(self.size, self.pos)
 
@@ -40,7 +48,7 @@ class Panel(PanelInterface):
         self._front_buffer: FrameBuffer = FrameBuffer(size = size)
 
         # define bounds of the panel
-        self.bounds: Bounds = Bounds(size, pos)
+        self.bounds: Bounds = Bounds(self.size, self.pos, owner = self)
 
         # print('INITIAL BUFFER', self._front_buffer.buffer)
     
@@ -81,7 +89,7 @@ class Panel(PanelInterface):
             - Pushes the previous frame to the back buffer
         '''
 
-        print(f'---- panel update ----')
+        if _log.debug_on: _log.debug(f'---- panel update ----')
 
         # validate the drawing object is of type Drawing/DrawingStack, throw error if not
         if not (isinstance(drawing, DrawingInterface) or isinstance(drawing, DrawingStackInterface)):
@@ -93,26 +101,70 @@ class Panel(PanelInterface):
         # manipulate the back buffer with current drawing
         self._back_buffer.manipulateBufferWithDrawing(drawing)
 
-        print('BUFFER AFTER UPDATE', self._back_buffer._buffer)
+        if _log.trace_on: _log.trace(f'BUFFER AFTER UPDATE {self._back_buffer._buffer}')
 
 
     @override
     def redrawWindow(self) -> None:
         '''
-            Redraws/Renders and refreshes this panel_window on the screen with the front_buffer
+            Redraws/Renders this panel_window with the front_buffer
+            - The window is only staged with noutrefresh, 
+              the rendering system updates the terminal once at the end of the frame
         '''
 
-        # push the back buffer to the front buffer
-        self._front_buffer.copy(self._back_buffer)
+        # get the spans of the back buffer that changed since the last redraw
+        changed_spans = self._back_buffer.changedSpans(self._front_buffer)
+
+        # push the changed spans of the back buffer to the front buffer
+        self._front_buffer.copySpans(self._back_buffer, changed_spans)
+        self._back_buffer.markClean()
 
         if not self.panel_window_exists(): return None
         
-        self.panelWindow.addstr(0,0, self.front_buffer)
-        self.panelWindow.refresh()
+        # only write the changed spans to the panel window
+        for y, x_start, x_end in changed_spans:
+            pixels: str = self._front_buffer.spanInPixels(y, x_start, x_end)
+
+            self.panelWindow.addstr(y, x_start, pixels)
+            self.staged_bytes += len(pixels.encode())
+
+        self.panelWindow.noutrefresh()
+
+    def compositeOnto(self, frame_buffer: FrameBuffer) -> None:
+        '''
+        Composites the current frame of this panel onto a screen sized frame buffer at the panel's position
+        - Used instead of the panel window when the engine renders in RenderMode.COMPOSITED
+        '''
+        frame_buffer.composite(self._back_buffer, self.pos)
 
     def reposition_window(self):
-        # clear front buffer
-        self._front_buffer.clear()
+        '''
+        Moves the panel window to the panel's position
+        - The window keeps its pixels when moved, so only the changed spans are redrawn
+        - Falls back to rebuilding the window if there is no window to move or it can't be moved
+        '''
+        if self.panel_window_exists() and self.panel is not None:
+            try:
+                self.panel.move(self.pos.y, self.pos.x)
+                return
+            except curses.error: pass
+
+        self.rebuild_window(self.size, self.pos)
+
+    def resize_window(self):
+        '''
+        Resizes the panel window to the panel's size
+        - Falls back to rebuilding the window if there is no window to resize or it can't be resized
+        '''
+        if self.panel_window_exists():
+            try:
+                self.panelWindow.resize(self.size.y, self.size.x + 1)
+
+                # redraw all the pixels on the resized window
+                self.panelWindow.erase()
+                self._front_buffer.clear()
+                return
+            except curses.error: pass
 
         self.rebuild_window(self.size, self.pos)
 
@@ -121,8 +173,8 @@ class Panel(PanelInterface):
         '''
         Checks if the panel window needs to be redrawn
         '''
-        # redraw if the front buffer has been updated
-        return not self._front_buffer.isEqualTo(self._back_buffer) # True if the two buffers are not equal
+        # redraw if the back buffer has changed spans that are not in the front buffer
+        return self._back_buffer.differsFrom(self._front_buffer)
     
     def panel_window_exists(self) -> bool: return self.panelWindow != None
 
@@ -146,12 +198,15 @@ class Panel(PanelInterface):
             self.panelWindow.keypad(True)
             self.panelWindow.nodelay(True)
 
-        self.panelWindow.refresh()
+        self.panelWindow.noutrefresh()
 
     def rebuild_window(self, size, pos):
         ''' Pop and recreate the panel window '''
         self.destroyWindow()
         self.createPanelWindow(size, pos)
+
+        # the new window is blank, clear front buffer so all the pixels are redrawn
+        self._front_buffer.clear()
     
     def destroyWindow(self):
         '''
@@ -160,11 +215,15 @@ class Panel(PanelInterface):
         '''
         if not self.panel_window_exists(): return
             
-        self.panelWindow.clear()
+        # erase, not clear: clear() makes the next doupdate repaint the whole terminal
+        self.panelWindow.erase()
 
-        self.panelWindow.refresh()
+        self.panelWindow.noutrefresh()
         self.panelWindow = None
 
+        # drop the panel off the panel stack so update_panels does not draw it
+        self.panel = None
+
     ''' KEY SCANNING / TYPING '''
     def scan_key(self) -> int:
         ''' Gets the key pressed '''
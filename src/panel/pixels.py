@@ -0,0 +1,16 @@
+import numpy as np
+
+PIXEL_DTYPE = '<U1'
+''' The fixed dtype of the pixels in frame buffers and drawings, one unicode character per pixel '''
+
+BLANK_PIXEL = ' '
+''' The pixel an empty cell holds '''
+
+
+def to_pixels(line: str) -> np.ndarray:
+    ''' Views the characters of a line as a 1D array of pixels without splitting it '''
+    return np.frombuffer(line.encode('utf-32-le'), dtype = PIXEL_DTYPE)
+
+def to_string(pixels: np.ndarray) -> str:
+    ''' Converts a 1D array of pixels back to a string '''
+    return pixels.tobytes().decode('utf-32-le')
@@ -1,4 +1,4 @@
-from typing import List
+import numpy as np
 
 from ..components.object import ColliderFill, CollisionType
 
@@ -6,45 +6,309 @@ from .._interface import EngineInterface
 
 from ..panel._interfaces import PanelInterface
 from ..components._interfaces import ColliderInterface
-from ._interfaces import ObjectSystem
+from ._interfaces import EngineSystem
+from .spatial_hash import SpatialHash
 
+from ..utils.debug_log import debug_log
 
-class CollisionSystem(ObjectSystem):
-    def __init__(self):
+_log = debug_log.channel('collision')
+
+
+class CollisionSystem(EngineSystem):
+    '''
+    Checks the collisions of the objects that have a collider
+    - A SpatialHash of the collidable objects is used as the broad phase,
+      an object is only checked against the objects in the cells its bounds cover
+    - prepare() is called once per tick to sync the hash with the game's collidable objects
+    - run_all() checks all the colliders at once with a vectorized AABB kernel,
+      every pair is checked once and the result is given to both of its objects
+    - A collider only collides with the colliders on the layers of its mask,
+      pairs where neither collides with the other are skipped before their bounds are checked
+    - The contacts are kept between ticks, so a collision is given as START on the tick it begins,
+      CONTINUING while it lasts and END on the tick after it stops, ENDs go to ended_collisions instead of collisions
+    - Static colliders, and colliders whose bounds haven't changed for sleep_after ticks, sleep.
+      Sleeping colliders are only checked as the targets of awake colliders, pairs of two sleeping colliders
+      are never checked and keep the contacts they had. A sleeping collider wakes up as soon as its bounds,
+      layer, mask or colliderFill change
+    '''
+    def __init__(self, cell_size: int = 8, all_pairs_threshold: int = 64, sleep_after: int = 30):
         super().__init__()
 
-    def run(self, my_object: ColliderInterface, game_engine: EngineInterface):
-        print(f'CHECKING COLLISIONS FOR: {my_object.tags}')
-        print(f'IN OBJECTS: {game_engine.collidable_objects}')
-        
-        self.check_collisions(my_object, game_engine.collidable_objects)
+        self.spatial_hash: SpatialHash = SpatialHash(cell_size)
+
+        self.all_pairs_threshold: int = all_pairs_threshold
+        ''' Up to this many colliders, run_all checks every pair instead of the pairs sharing a cell of the hash '''
+
+        # the contacts found on the last tick: (object, other) when object collides with other
+        # a dict is used as an ordered set, so collisions are given in a deterministic order
+        self._contacts: dict[tuple[ColliderInterface, ColliderInterface], None] = {}
+
+        self.sleep_after: int = sleep_after
+        ''' The ticks a collider's bounds have to stay the same for it to sleep, None keeps colliders awake '''
+
+        # the extents, layer, mask and fill of every collider on the last tick, and the ticks they have stayed the same
+        self._last_states: dict[ColliderInterface, tuple] = {}
+        self._still_ticks: dict[ColliderInterface, int] = {}
+
+        # the contacts with colliders that were forgotten, ended on the next tick
+        self._forgotten_contacts: list[tuple[ColliderInterface, ColliderInterface]] = []
+
+    def is_sleeping(self, obj: ColliderInterface) -> bool:
+        ''' Checks if the collider is static or asleep, so it is only checked as a target '''
+        if obj.isStatic: return True
+
+        return self.sleep_after is not None and self._still_ticks.get(obj, 0) >= self.sleep_after
+
+    def wake(self, obj: ColliderInterface):
+        ''' Wakes the collider up, called by prepare() when the collider moved or its layer, mask or colliderFill changed '''
+        self._still_ticks[obj] = 0
+
+    def forget(self, objects: list[ColliderInterface]):
+        '''
+        Drops everything the system keeps of the colliders, called when they leave the game e.g are garbage collected
+        - So a pooled collider that is reused starts awake and with no contacts, even if no tick ran since it left
+        - The colliders that were touching them get their END on the next tick
+        '''
+        forgotten = {obj for obj in objects if obj in self.spatial_hash or obj in self._still_ticks}
+
+        if not forgotten: return
+
+        for obj in forgotten:
+            self.spatial_hash.remove(obj)
+
+            self._last_states.pop(obj, None)
+            self._still_ticks.pop(obj, None)
+
+        contacts: dict[tuple[ColliderInterface, ColliderInterface], None] = {}
+
+        for obj, other in self._contacts:
+            if obj in forgotten: continue
+
+            if other in forgotten: self._forgotten_contacts.append((obj, other))
+            else: contacts[(obj, other)] = None
+
+        self._contacts = contacts
+
+        self._forgotten_contacts = [(obj, other) for obj, other in self._forgotten_contacts if obj not in forgotten]
+
+    def prepare(self, game_engine: EngineInterface):
+        '''
+        Syncs the spatial hash with the collidable objects of the game
+        - Called once per tick, before the objects are checked
+        - Adds the new colliders, removes the ones that left the game
+          and refreshes the bounds of the rest so moved colliders change cells
+        - Counts the ticks the bounds of every collider have stayed the same, to put it to sleep
+        '''
+        colliders = game_engine.collidable_objects
+
+        # remove the colliders that are no longer in the game
+        in_game = set(colliders)
+
+        for obj in self.spatial_hash.objects:
+            if obj not in in_game: 
+                self.spatial_hash.remove(obj)
+
+                del self._last_states[obj]
+                del self._still_ticks[obj]
+
+        for obj in colliders:
+            if obj in self.spatial_hash: obj.bounds.refresh()
+            else: self.spatial_hash.insert(obj)
+
+            # wake the collider up if its bounds changed, or what it collides with
+            # a sleeping pair isn't checked, so it would keep a contact its new layer or mask rules out
+            state = obj.bounds.extents + (obj.layer, obj.mask, obj.colliderFill)
+
+            if self._last_states.get(obj) == state: self._still_ticks[obj] += 1
+            else: self.wake(obj)
+
+            self._last_states[obj] = state
+
+    def run(self, game_engine: EngineInterface):
+        ''' Checks the collisions of all the collidable objects of the game, see run_all() '''
+        self.run_all(game_engine)
+
+    def run_all(self, game_engine: EngineInterface):
+        '''
+        Checks the collisions of all the collidable objects of the game in one batched pass
+        - Called once per tick, after the objects have been updated
+        - The extents of the colliders are packed into arrays once,
+          the FILLED and HOLLOW checks of all the candidate pairs are then computed in one vectorized step
+        - The collisions found are given to both objects of a pair through collide_with,
+          as START or CONTINUING depending on the contacts of the last tick,
+          the contacts of the last tick that stopped are given through end_collision_with
+        '''
+        self.prepare(game_engine)
+
+        colliders: list[ColliderInterface] = self.spatial_hash.objects
 
-    def check_collisions(self, my_object: ColliderInterface, objects_can_collide: List[ColliderInterface]):
-        ''' Checks the collisions of an object with all the other objects '''
         # clear all collisions
-        my_object.clear_collisions()
+        for obj in colliders: obj.clear_collisions()
 
-        # iterate thru all the objects that can collide with my_object
-        for other in objects_can_collide:
-            if other is my_object: continue
-            
-            # if colliderObject is FILLED
-            # check if other object is within the bounds of my_object
-            if my_object.colliderFill == ColliderFill.FILLED:
-                print(f'COLLIDER IS FILLED')
-                if self.are_within_bounds(my_object, other):
-                    print(f'COLLIDED WITH {other.tags}')
-                    my_object.collide_with(other, CollisionType.CONTINUING)
-
-             # if colliderObject is HOLLOW
-            else:
-                print(f'COLLIDER IS HOLLOW')
-                # check if the object is only touching the borders of the colliderObject and 
-                # not the inside the colliderObject
-                if self.are_only_touching_borders(my_object, other):
-                    print(f'COLLIDED WITH {other.tags}')
-                    my_object.collide_with(other, CollisionType.CONTINUING)
+        contacts: dict[tuple[ColliderInterface, ColliderInterface], None] = {}
+
+        if len(colliders) >= 2: self._find_contacts(colliders, contacts)
+
+        # keep the contacts between sleeping colliders, neither has moved
+        for obj, other in self._contacts:
+            if obj in self.spatial_hash and other in self.spatial_hash and self.is_sleeping(obj) and self.is_sleeping(other):
+                contacts[(obj, other)] = None
+
+        # give the contacts to the colliders
+        for obj, other in contacts:
+            obj.collide_with(other, CollisionType.CONTINUING if (obj, other) in self._contacts else CollisionType.START)
+
+        # end the contacts of the last tick that no longer collide
+        for obj, other in self._contacts:
+            if (obj, other) not in contacts and obj in self.spatial_hash: obj.end_collision_with(other)
+
+        # end the contacts with the colliders that were forgotten
+        for obj, other in self._forgotten_contacts:
+            if obj in self.spatial_hash: obj.end_collision_with(other)
+
+        self._forgotten_contacts = []
+
+        self._contacts = contacts
+
+        if _log.debug_on: _log.debug(f'COLLIDERS: {len(colliders)} | CONTACTS: {len(contacts)}')
+
+    def _find_contacts(self, colliders: list[ColliderInterface], contacts: dict[tuple[ColliderInterface, ColliderInterface], None]):
+        ''' Adds the (object, other) pairs of colliders where object collides with other to contacts '''
+        # pack the extents and sizes of the colliders
+        extents = np.array([obj.bounds.extents + (obj.size.x, obj.size.y) for obj in colliders], dtype = np.int64)
+        filled = np.array([obj.colliderFill == ColliderFill.FILLED for obj in colliders], dtype = bool)
+        layers = np.array([obj.layer for obj in colliders], dtype = np.int64)
+        masks = np.array([obj.mask for obj in colliders], dtype = np.int64)
+        awake = np.array([not self.is_sleeping(obj) for obj in colliders], dtype = bool)
+
+        # get the candidate pairs whose layers can collide, with at least one awake collider
+        first, second = self._candidate_pairs(colliders, layers, masks, awake)
+
+        # check each pair both ways
+        hits_first, hits_second = self._collision_masks(extents, filled, first, second)
+
+        # keep the directions whose layers collide
+        hits_first &= (masks[first] & layers[second]) != 0
+        hits_second &= (masks[second] & layers[first]) != 0
+
+        for i, j in zip(first[hits_first].tolist(), second[hits_first].tolist()):
+            contacts[(colliders[i], colliders[j])] = None
+
+        for i, j in zip(first[hits_second].tolist(), second[hits_second].tolist()):
+            contacts[(colliders[j], colliders[i])] = None
+
+    def _candidate_pairs(self, colliders: list[ColliderInterface], layers: np.ndarray, masks: np.ndarray, awake: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Gives the index pairs of the colliders that can possibly collide
+        - Every pair of layer groups that can collide if there are only a few colliders
+        - Else the pairs that share a cell of the spatial hash and whose layers can collide
+        - Pairs of two sleeping colliders are skipped
+        '''
+        count: int = len(colliders)
+
+        if count <= self.all_pairs_threshold: return self._layer_group_pairs(layers, masks, awake)
+
+        indices: dict[ColliderInterface, int] = {obj: i for i, obj in enumerate(colliders)}
+
+        firsts: list[np.ndarray] = []
+        seconds: list[np.ndarray] = []
+
+        for cell in self.spatial_hash.cells:
+            if len(cell) < 2: continue
+
+            cell_indices = np.array([indices[obj] for obj in cell])
+            i, j = np.triu_indices(len(cell), 1)
+
+            firsts.append(cell_indices[i])
+            seconds.append(cell_indices[j])
+
+        if not firsts: return np.empty(0, dtype = np.int64), np.empty(0, dtype = np.int64)
+
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+
+        # order every pair and drop the pairs that share more than one cell
+        pairs = np.unique(np.minimum(first, second) * count + np.maximum(first, second))
+
+        first, second = pairs // count, pairs % count
+
+        # drop the pairs where neither collides with the other, and the pairs of sleeping colliders
+        can_collide = (((masks[first] & layers[second]) != 0) | ((masks[second] & layers[first]) != 0)) & (awake[first] | awake[second])
+
+        return first[can_collide], second[can_collide]
+
+    def _layer_group_pairs(self, layers: np.ndarray, masks: np.ndarray, awake: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Gives the index pairs of the colliders whose layers can collide
+        - Colliders are grouped by their (layer, mask, awake), and whole pairs of groups that can't collide are skipped
+        '''
+        # group the colliders by (layer, mask, awake)
+        keys, group_of = np.unique(np.stack((layers, masks, awake), axis = 1), axis = 0, return_inverse = True)
+        groups: list[np.ndarray] = [np.flatnonzero(group_of.ravel() == g) for g in range(len(keys))]
+
+        firsts: list[np.ndarray] = []
+        seconds: list[np.ndarray] = []
+
+        for g, (layer, mask, is_awake) in enumerate(keys):
+            for h in range(g, len(keys)):
+                other_layer, other_mask, other_is_awake = keys[h]
+
+                # skip the groups where neither collides with the other, and the pairs of sleeping groups
+                if not (mask & other_layer or other_mask & layer) or not (is_awake or other_is_awake): continue
+
+                if g == h:
+                    i, j = np.triu_indices(len(groups[g]), 1)
+                    firsts.append(groups[g][i])
+                    seconds.append(groups[g][j])
+                else:
+                    i, j = np.meshgrid(groups[g], groups[h], indexing = 'ij')
+                    firsts.append(i.ravel())
+                    seconds.append(j.ravel())
+
+        if not firsts: return np.empty(0, dtype = np.int64), np.empty(0, dtype = np.int64)
+
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def _collision_masks(self, extents: np.ndarray, filled: np.ndarray, first: np.ndarray, second: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Vectorized are_within_bounds and are_only_touching_borders for many pairs at once
+        - extents holds (x_start, x_end, y_start, y_end, size_x, size_y) of every collider
+        - Returns the masks of the pairs where first collides with second, and where second collides with first
+        '''
+        a = extents[first]
+        b = extents[second]
+
+        a_x_start, a_x_end, a_y_start, a_y_end, a_w, a_h = a.T
+        b_x_start, b_x_end, b_y_start, b_y_end, b_w, b_h = b.T
+
+        # check if each object is within the bounds of possible collision of the other
+        b_within_a = (a_x_start - b_w <= b_x_start) & (a_x_end + b_w >= b_x_end) & (a_y_start - b_h <= b_y_start) & (a_y_end + b_h >= b_y_end)
+        a_within_b = (b_x_start - a_w <= a_x_start) & (b_x_end + a_w >= a_x_end) & (b_y_start - a_h <= a_y_start) & (b_y_end + a_h >= a_y_end)
+
+        # check if each object is fully inside the other
+        b_inside_a = (b_x_start >= a_x_start) & (b_x_end <= a_x_end) & (b_y_start >= a_y_start) & (b_y_end <= a_y_end)
+        a_inside_b = (a_x_start >= b_x_start) & (a_x_end <= b_x_end) & (a_y_start >= b_y_start) & (a_y_end <= b_y_end)
+
+        # FILLED colliders collide with anything within their bounds,
+        # HOLLOW colliders only with what touches their borders without being fully inside them
+        hits_first = np.where(filled[first], b_within_a, b_within_a & ~b_inside_a)
+        hits_second = np.where(filled[second], a_within_b, a_within_b & ~a_inside_b)
+
+        return hits_first, hits_second
+
+    def collides(self, my_object: ColliderInterface, other: ColliderInterface) -> bool:
+        '''
+        Checks if my_object collides with other, one pair at a time
+        - The scalar reference of the vectorized kernel of run_all, which gives the same collisions
+        '''
+        # my_object only collides with the objects on the layers of its mask
+        if other is my_object or not my_object.collides_with_layer(other): return False
+
+        # FILLED colliders collide with anything within their bounds,
+        # HOLLOW colliders only with what touches their borders without being fully inside them
+        if my_object.colliderFill == ColliderFill.FILLED: return self.are_within_bounds(my_object, other)
 
+        return self.are_only_touching_borders(my_object, other)
 
     def are_within_bounds(self, colliderObject: PanelInterface, other: PanelInterface) -> bool:
         '''
@@ -10,12 +10,22 @@ class FrameTimeKeeper(EngineSystem):
     '''
     delta_time: float = 0
 
+    spin_threshold_ns: int = 2_000_000
+    '''
+    The last part of a frame's budget, in nanoseconds, that is spun instead of slept
+    - time.sleep can overshoot by a millisecond or more, spinning the end of the budget keeps frames accurate
+    '''
+
     def __init__(self, game_engine):
         
         self.game_engine = game_engine
 
-        self.dt_count_start: float = 0
-        self.dt_count_end: float = 0
+        # marks of the start and end of the last frame, perf_counter nanoseconds
+        self.dt_count_start: int = 0
+        self.dt_count_end: int = 0
+
+        self.missed_frames: int = 0
+        ''' The number of frames that took longer than the frame budget of game.frame_cap '''
 
         super().__init__()
 
@@ -39,31 +49,45 @@ class FrameTimeKeeper(EngineSystem):
     def run(self, game_engine):
         '''
         Marks the start of another game loop
+        - Waits out what is left of the last frame's budget before marking it
 
         '''
-        # get the end of the last loop
+        # wait out the rest of the last frame's budget
         # if this isn't the first loop of the game
-        self.dt_count_end = time.time() if self.dt_count_start!= 0 else self.dt_count_start
+        if self.dt_count_start != 0: self._limit_frames_to_cap()
+
+        # get the end of the last loop
+        self.dt_count_end = time.perf_counter_ns()
 
         # calculate delta time/time passed, convert to milliseconds
-        self.delta_time = float((self.dt_count_end - self.dt_count_start) * 1000)
+        self.delta_time = (self.dt_count_end - self.dt_count_start) / 1_000_000 if self.dt_count_start != 0 else 0.0
 
         # mark the start of the next loop
-        self.dt_count_start = time.time()
+        self.dt_count_start = self.dt_count_end
 
-        self._limit_frames_to_cap()
+    def _limit_frames_to_cap(self):
+        '''
+        Sleeps only what is left of the frame budget since the start of the frame
+        - Sleeps most of the remaining budget then spins the rest for sub-millisecond accuracy
+        - Counts a missed frame if the frame took longer than its budget
+        - A frame_cap of 0 or None runs the frames as fast as possible
+        '''
+        if not self.game_engine.frame_cap: return
 
-        
+        # get the frame budget, nanoseconds, accoring to game.frame_cap
+        self._frame_budget_ns: int = 1_000_000_000 // self.game_engine.frame_cap
 
-    def _limit_frames_to_cap(self):
-        # # get preferred delta time accoring to game.frame_cap
-        self._pref_dt = 1 / self.game_engine.frame_cap
+        deadline: int = self.dt_count_start + self._frame_budget_ns
+        remaining: int = deadline - time.perf_counter_ns()
 
-        # # check if this frame's delta_time was longer than pref_dt
-        # # if so ignore limit_frames_to_cap
-        # if self.delta_time >= self._pref_dt: return
+        # check if this frame took longer than its budget
+        # if so, don't wait
+        if remaining <= 0:
+            self.missed_frames += 1
+            return
 
-        # # if not time.sleep the remaining time
-        time.sleep(self._pref_dt)
+        # sleep the remaining time, but the last part of it
+        if remaining > self.spin_threshold_ns: time.sleep((remaining - self.spin_threshold_ns) / 1_000_000_000)
 
-        # time.sleep(.005)
+        # spin the last part of the remaining time
+        while time.perf_counter_ns() < deadline: pass
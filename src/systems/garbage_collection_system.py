@@ -2,15 +2,46 @@ from typing import override
 from ..systems._interfaces import EngineSystem
 
 class GarbageCollectionSystem(EngineSystem):
+    '''
+    Disposes the objects of the game screen that were marked garbage during the last frame
+    - Runs once at the start of every frame, before the objects are iterated, so no list is changed while iterated
+    - Finds the garbage in one pass and removes it from the game screen in one batch
+    - The windows of the disposed objects are only staged, they are cleared from the terminal by the frame's one update
+    - Disposed objects that were acquired from the game screen's ObjectPool are released back to it,
+      after the collision system has forgotten them
+    '''
+    def __init__(self):
+        super().__init__()
+
+        self.collected: int = 0
+        ''' The number of objects disposed on the last run '''
+
+        self.total_collected: int = 0
+        ''' The number of objects disposed since the game started '''
+
     @override
     def run(self, game_engine):
+        game_screen = game_engine.game_screen
+
+        # objects released on the last frame can now be reused
+        game_screen.object_pool.recycle()
+
         # find all game objects that are marked garbage
-        # and delete them
-        for object in game_engine.objects:
-            # skip objects that are not garbage
-            if not object.isGarbage: continue
-
-            # delete garbage ones
-            object.dispose()
-            game_engine.game_screen.objects.remove(object)
-            del object
+        garbage = [object for object in game_screen.objects if object.isGarbage]
+
+        self.collected = len(garbage)
+        self.total_collected += self.collected
+
+        if not garbage: return
+
+        # dispose them, staging their windows to be cleared
+        for object in garbage: object.dispose()
+
+        # and remove them from the game screen at once
+        game_screen.removeObjects(garbage)
+
+        # the collision system forgets them, pooled ones may be reused before the next tick
+        if game_engine.collision_system is not None: game_engine.collision_system.forget(garbage)
+
+        # release the pooled ones to be reused
+        for object in garbage: game_screen.object_pool.release(object)
@@ -0,0 +1,138 @@
+from collections import deque
+import json
+import time
+
+import numpy as np
+
+
+class FrameProfiler:
+    '''
+    Times the phases of every frame of the engine
+    - Phases: frame keeper, garbage collector, screen effects, objects, collision, screen update and render
+    - objects is the effects and updates of all the objects, timed once per tick
+    - With per_class, the effects and updates are timed apart on every object instead,
+      as effects and update, and per Object subclass, e.g 'update:Bullet'
+    - The time of a phase is summed over the frame, e.g the ticks of a frame in fixed timestep mode
+    - The totals of the last `capacity` frames are kept in a ring buffer, to give p50/p95/p99 of every phase
+    - Every timed span is also kept as an event, to be exported as a Chrome trace (chrome://tracing, Perfetto)
+    '''
+    PHASES: tuple[str, ...] = ('frame keeper', 'garbage collector', 'screen effects', 'objects', 'effects', 'update',
+                               'collision', 'screen update', 'render')
+
+    def __init__(self, capacity: int = 600, per_class: bool = False, max_events: int = 100_000):
+        self.capacity: int = capacity
+
+        self.per_class: bool = per_class
+        ''' Time the effects and updates of every object, per Object subclass, instead of all the objects at once '''
+
+        self.frames: int = 0
+        ''' The number of frames profiled '''
+
+        # the time of every phase on the last `capacity` frames, nanoseconds
+        self._history: dict[str, deque[int]] = {}
+
+        # the time of every phase on this frame, nanoseconds
+        self._frame: dict[str, int] = {}
+
+        self._frame_start: int = 0
+
+        # timed spans for the trace: (name, start_ns, duration_ns)
+        self._events: deque[tuple[str, int, int]] = deque(maxlen = max_events)
+
+    def now(self) -> int:
+        return time.perf_counter_ns()
+
+    def begin_frame(self) -> int:
+        ''' Starts timing a new frame, returns its start time '''
+        self._frame = {}
+        self._frame_start = time.perf_counter_ns()
+
+        return self._frame_start
+
+    def add(self, phase: str, start: int, object = None) -> int:
+        '''
+        Adds the time from start to now to the phase, returns now so phases can be chained
+        - object is the object the phase ran on, for per class timing
+        '''
+        end: int = time.perf_counter_ns()
+        duration: int = end - start
+
+        self._frame[phase] = self._frame.get(phase, 0) + duration
+
+        name: str = phase
+
+        if self.per_class and object is not None:
+            name = f'{phase}:{object.__class__.__name__}'
+            self._frame[name] = self._frame.get(name, 0) + duration
+
+        self._events.append((name, start, duration))
+
+        return end
+
+    def end_frame(self) -> None:
+        ''' Pushes the times of the frame to the ring buffer '''
+        end: int = time.perf_counter_ns()
+
+        self._frame['frame'] = end - self._frame_start
+        self._events.append(('frame', self._frame_start, end - self._frame_start))
+
+        # phases that didn't run this frame took no time
+        for phase in self._history.keys() - self._frame.keys(): self._history[phase].append(0)
+
+        for phase, duration in self._frame.items():
+            history = self._history.get(phase)
+
+            if history is None: history = self._history[phase] = deque([0] * min(self.frames, self.capacity), maxlen = self.capacity)
+
+            history.append(duration)
+
+        self.frames += 1
+
+    def stats(self, phase: str) -> dict[str, float]:
+        ''' Returns the mean, p50, p95 and p99 of the phase over the ring buffer, milliseconds '''
+        history = self._history.get(phase)
+
+        if not history: return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+
+        times = np.fromiter(history, dtype = np.float64, count = len(history)) / 1e6
+        p50, p95, p99 = np.percentile(times, (50, 95, 99))
+
+        return {'mean': float(times.mean()), 'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        ''' Returns the stats of every phase, the engine's phases first '''
+        phases = ['frame'] + [phase for phase in self.PHASES if phase in self._history]
+        phases += sorted(phase for phase in self._history if phase not in phases)
+
+        return {phase: self.stats(phase) for phase in phases}
+
+    def report(self) -> list[str]:
+        ''' Returns the summary as lines of text, e.g for the ProfilerOverlay '''
+        lines: list[str] = [f'{"phase":<24} {"p50":>7} {"p95":>7} {"p99":>7}']
+
+        for phase, stats in self.summary().items():
+            lines.append(f'{phase[:24]:<24} {stats["p50"]:>7.2f} {stats["p95"]:>7.2f} {stats["p99"]:>7.2f}')
+
+        return lines
+
+    def chrome_trace(self) -> dict:
+        ''' Returns the recorded spans in the Chrome trace event format '''
+        events = [
+            {'name': name, 'cat': 'frame' if name == 'frame' else 'phase', 'ph': 'X',
+             'ts': start / 1000, 'dur': duration / 1000, 'pid': 0, 'tid': 0}
+            for name, start, duration in self._events
+        ]
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str) -> None:
+        ''' Writes the recorded spans to path as Chrome trace JSON '''
+        with open(path, 'w', encoding = 'utf-8') as file:
+            json.dump(self.chrome_trace(), file)
+
+    def clear(self) -> None:
+        ''' Forgets all the recorded frames and spans '''
+        self._history = {}
+        self._frame = {}
+        self._events.clear()
+        self.frames = 0
@@ -0,0 +1,89 @@
+from bisect import insort
+
+from ..panel._interfaces import PanelInterface
+from ..utils.buckets import Buckets
+
+
+class RenderOrder:
+    '''
+    Keeps objects in order of priority, lowest first
+    - Objects are bucketed by priority, the buckets are kept in sorted order of priority
+    - Objects of the same priority keep the order they were added in
+    - The buckets are updated when objects are added, removed or change priority,
+      so iterating the objects every frame needs no sorting
+    '''
+    def __init__(self):
+        # the objects of every priority
+        self._buckets: Buckets = Buckets()
+
+        # the priorities that have objects, sorted
+        self._priorities: list[int] = []
+
+        # the priority every object is bucketed under
+        self._object_priorities: dict[PanelInterface, int] = {}
+
+        # the objects in order, None until the next read after a change
+        self._ordered: list[PanelInterface] = None
+
+    def __contains__(self, object: PanelInterface) -> bool:
+        return object in self._object_priorities
+
+    def __len__(self) -> int:
+        return len(self._object_priorities)
+
+    @property
+    def objects(self) -> list[PanelInterface]:
+        '''
+        Returns the objects in order of priority
+        - The list is only rebuilt after a change, don't modify it
+        '''
+        if self._ordered is None:
+            self._ordered = [obj for priority in self._priorities for obj in self._buckets.get(priority)]
+
+        return self._ordered
+
+    def add(self, object: PanelInterface) -> None:
+        ''' Adds the object to the bucket of its priority, and follows its priority from then on '''
+        if object in self._object_priorities: return
+
+        object.priority_listeners.add(self.update)
+
+        self._place(object)
+
+    def remove(self, object: PanelInterface) -> None:
+        ''' Removes the object from the order '''
+        if object not in self._object_priorities: return
+
+        object.priority_listeners.remove(self.update)
+
+        self._unplace(object)
+
+    def update(self, object: PanelInterface) -> None:
+        ''' Moves the object to the bucket of its new priority '''
+        if object not in self._object_priorities: return
+
+        if self._object_priorities[object] == object.priority: return
+
+        self._unplace(object)
+        self._place(object)
+
+    def clear(self) -> None:
+        ''' Removes all the objects from the order '''
+        for object in list(self._object_priorities): self.remove(object)
+
+    def _place(self, object: PanelInterface) -> None:
+        priority: int = object.priority
+
+        if self._buckets.add(priority, object): insort(self._priorities, priority)
+
+        self._object_priorities[object] = priority
+
+        self._ordered = None
+
+    def _unplace(self, object: PanelInterface) -> None:
+        priority: int = self._object_priorities.pop(object)
+
+        # only the priorities that have objects are iterated
+        if self._buckets.discard(priority, object): self._priorities.remove(priority)
+
+        self._ordered = None
@@ -1,11 +1,31 @@
 from ._interfaces import ObjectSystem
+from .._interface import RenderMode
+from ..metrics.vec2 import Vec2
 from ..panel._interfaces import PanelInterface
+from ..panel.compositor import Compositor
 
 
 class RenderingSystem(ObjectSystem):
     '''
         Responsible for rendering the Object's panels on the screen
+        - In RenderMode.PANELS every object's panel window is staged on its own,
+          and the terminal is updated once per frame by flush()
+        - In RenderMode.COMPOSITED, or on render backends without panel windows,
+          every object is composited onto one screen sized frame buffer, which is written to the backend once per frame by flush()
     '''
+    def __init__(self, render_mode: RenderMode = RenderMode.PANELS):
+        super().__init__()
+
+        self.render_mode: RenderMode = render_mode
+
+        self.compositor: Compositor = None
+        ''' Composites the objects in RenderMode.COMPOSITED, created on the first frame '''
+
+        self.frame_bytes: int = 0
+        ''' The bytes of pixels flushed to the terminal on the last frame '''
+
+        # the bytes of pixels staged so far on this frame
+        self._staged_bytes: int = 0
 
     def run_all(self):
         game_objs = self.game_engine.objects
@@ -20,19 +40,46 @@ class RenderingSystem(ObjectSystem):
         # redraw/rerender the object's panels if the object wants to redraw 
         if object.shouldRedraw(): 
             object.render(game_engine)
-        
-    def with_priority(self, objects: list[PanelInterface]) -> list[PanelInterface]:
-        ''' Rearrange objects with their priority'''
-        stacked_objs: list[PanelInterface] = []
-        
-        # get all the priorities
-        priorities: list[int] = [obj.priority for obj in objects]
-        
-        priorities.sort() # sort them
-        
-        # add the objects with their sorted priorities
-        for pr in priorities:
-            stacked_objs.extend([obj for obj in objects if obj.priority == pr])
-        
-        return stacked_objs
+
+            # count the bytes the object staged on its panel window
+            self._staged_bytes += object.staged_bytes
+            object.staged_bytes = 0
+
+        # composite the object onto the screen
+        if game_engine.composites and not object.isGarbage:
+            self._get_compositor(game_engine).compose(object)
+
+    def flush(self, game_engine):
+        '''
+        Called once at the end of every frame
+        - In RenderMode.PANELS the staged panel windows are flushed to the terminal in one update
+        - When compositing, the changed spans of the composited frame are written to the render backend
+        '''
+        if game_engine.composites:
+            self._staged_bytes += self._get_compositor(game_engine).present(game_engine.backend)
+
+        # end the frame on the backend
+        if game_engine.backend.ready: game_engine.backend.flush()
+
+        # report the bytes flushed on this frame
+        self.frame_bytes = self._staged_bytes
+        self._staged_bytes = 0
+
+    def invalidate(self):
+        ''' Called when the screen has been cleared, so the next frame is written in full '''
+        if self.compositor is not None: self.compositor.invalidate()
+
+    def _get_compositor(self, game_engine) -> Compositor:
+        # create the compositor with the size of the game window
+        if self.compositor is None:
+            self.compositor = Compositor(Vec2(game_engine.window_width, game_engine.window_height))
+
+        return self.compositor
+
+    def in_order(self, game_screen) -> list[PanelInterface]:
+        '''
+        Returns the objects of the game screen in order of priority
+        - The order is maintained by the game screen's RenderOrder as objects are added, removed and re-prioritized
+        '''
+        return game_screen.render_order.objects
     
\ No newline at end of file
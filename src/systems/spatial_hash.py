@@ -0,0 +1,93 @@
+from ..metrics.bounds import Bounds
+from ..panel._interfaces import PanelInterface
+from ..utils.buckets import Buckets
+
+
+class SpatialHash:
+    '''
+    A uniform grid that buckets objects by the cells their Bounds cover
+    - Used as the broad phase of the CollisionSystem, only objects that share a cell can collide
+    - The cells of an object are updated when its bounds move or resize
+    - Cells are keyed on (x // cell_size, y // cell_size) of the bounds' extents, both ends included
+    '''
+    def __init__(self, cell_size: int = 8):
+        if cell_size < 1: raise ValueError(f'cell_size must be at least 1, {cell_size} given')
+
+        self.cell_size: int = cell_size
+
+        # the objects in every occupied cell
+        self._cells: Buckets = Buckets()
+
+        # the range of cells every object covers: (cx_start, cx_end, cy_start, cy_end)
+        self._object_cells: dict[PanelInterface, tuple[int, int, int, int]] = {}
+
+    def __contains__(self, object: PanelInterface) -> bool:
+        return object in self._object_cells
+
+    def __len__(self) -> int:
+        return len(self._object_cells)
+
+    @property
+    def objects(self) -> list[PanelInterface]:
+        ''' Returns all the objects in the hash '''
+        return list(self._object_cells)
+
+    @property
+    def cells(self) -> list[list[PanelInterface]]:
+        ''' Returns the objects in every occupied cell '''
+        return [list(cell) for cell in self._cells.values()]
+
+    def insert(self, object: PanelInterface) -> None:
+        ''' Adds the object to the cells its bounds cover, and follows its bounds from then on '''
+        if object in self._object_cells: return
+
+        object.bounds.listeners.add(self.update)
+
+        self._place(object, self._cell_range(object.bounds))
+
+    def remove(self, object: PanelInterface) -> None:
+        ''' Removes the object from the hash '''
+        if object not in self._object_cells: return
+
+        object.bounds.listeners.remove(self.update)
+
+        self._unplace(object)
+
+    def update(self, object: PanelInterface) -> None:
+        ''' Moves the object to the cells its bounds now cover, if they changed '''
+        if object not in self._object_cells: return
+
+        cell_range = self._cell_range(object.bounds)
+
+        if self._object_cells[object] == cell_range: return
+
+        self._unplace(object)
+        self._place(object, cell_range)
+
+    def clear(self) -> None:
+        ''' Removes all the objects from the hash '''
+        for object in self.objects: self.remove(object)
+
+    def _cell_range(self, bounds: Bounds) -> tuple[int, int, int, int]:
+        return (
+            bounds.x_start // self.cell_size,
+            bounds.x_end // self.cell_size,
+            bounds.y_start // self.cell_size,
+            bounds.y_end // self.cell_size,
+        )
+
+    def _place(self, object: PanelInterface, cell_range: tuple[int, int, int, int]) -> None:
+        cx_start, cx_end, cy_start, cy_end = cell_range
+
+        for cx in range(cx_start, cx_end + 1):
+            for cy in range(cy_start, cy_end + 1):
+                self._cells.add((cx, cy), object)
+
+        self._object_cells[object] = cell_range
+
+    def _unplace(self, object: PanelInterface) -> None:
+        cx_start, cx_end, cy_start, cy_end = self._object_cells.pop(object)
+
+        for cx in range(cx_start, cx_end + 1):
+            for cy in range(cy_start, cy_end + 1):
+                self._cells.discard((cx, cy), object)
@@ -0,0 +1,53 @@
+class Buckets:
+    '''
+    Items grouped under keys, e.g the objects in every cell of a SpatialHash or with every tag of an ObjectRegistry
+    - Every bucket is an ordered set, its items keep the order they were added in, so lookups are deterministic
+    - A bucket is created by the first add() to its key and dropped when discard() empties it,
+      so only the keys in use are held and iterated
+    '''
+    def __init__(self):
+        # dicts are used as ordered sets
+        self._buckets: dict = {}
+
+    def __contains__(self, key) -> bool:
+        return key in self._buckets
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def get(self, key):
+        ''' Returns the items under the key, empty if there are none, don't modify it '''
+        return self._buckets.get(key, ())
+
+    def keys(self):
+        return self._buckets.keys()
+
+    def values(self):
+        return self._buckets.values()
+
+    def add(self, key, item) -> bool:
+        ''' Adds the item under the key, returns True if the key had no bucket yet '''
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            self._buckets[key] = {item: None}
+            return True
+
+        bucket[item] = None
+        return False
+
+    def discard(self, key, item) -> bool:
+        ''' Removes the item from under the key if it is there, returns True if the key's bucket was dropped '''
+        bucket = self._buckets.get(key)
+
+        if bucket is None: return False
+
+        bucket.pop(item, None)
+
+        if bucket: return False
+
+        del self._buckets[key]
+        return True
+
+    def clear(self) -> None:
+        self._buckets = {}
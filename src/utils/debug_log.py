@@ -0,0 +1,145 @@
+from collections import deque
+from enum import IntEnum
+import os
+import time
+
+
+class Level(IntEnum):
+    ''' Levels of debug messages, a channel writes the messages at or above its level '''
+    TRACE = 5
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    OFF = 100
+
+
+class Channel:
+    '''
+    A named channel of the DebugLog, e.g 'collision' or 'render'
+    - Call sites are guarded by the channel's *_on flags, so a disabled message costs one attribute check
+      and its f-string is never built:
+
+    ```python
+     _log = debug_log.channel('collision')
+
+     if _log.debug_on: _log.debug(f'CHECKING COLLISIONS FOR: {my_object.tags}')
+    ```
+    '''
+    __slots__ = ('name', 'level', 'trace_on', 'debug_on', 'info_on', 'warning_on', 'error_on', '_log')
+
+    def __init__(self, name: str, log: 'DebugLog', level: Level = Level.OFF):
+        self.name: str = name
+        self._log: DebugLog = log
+
+        self.set_level(level)
+
+    def set_level(self, level: Level) -> None:
+        ''' Sets the level of the channel and the guard flags of its levels '''
+        self.level: Level = Level(level)
+
+        self.trace_on: bool = self.level <= Level.TRACE
+        self.debug_on: bool = self.level <= Level.DEBUG
+        self.info_on: bool = self.level <= Level.INFO
+        self.warning_on: bool = self.level <= Level.WARNING
+        self.error_on: bool = self.level <= Level.ERROR
+
+    def log(self, level: Level, message: str) -> None:
+        if level >= self.level: self._log.write(self.name, level, message)
+
+    def trace(self, message: str) -> None: self.log(Level.TRACE, message)
+
+    def debug(self, message: str) -> None: self.log(Level.DEBUG, message)
+
+    def info(self, message: str) -> None: self.log(Level.INFO, message)
+
+    def warning(self, message: str) -> None: self.log(Level.WARNING, message)
+
+    def error(self, message: str) -> None: self.log(Level.ERROR, message)
+
+
+class DebugLog:
+    '''
+    Structured debug log of the engine, written to a ring buffer and optionally a file, never to the terminal curses draws on
+    - Messages are written to per subsystem channels, every channel has its own level, all are OFF by default
+    - The ring buffer keeps the last `capacity` records: (time_ns, channel, level, message)
+    - Levels can be set from the TERM_ENGINE_LOG environment variable when the module is imported,
+      e.g TERM_ENGINE_LOG="collision=debug,render=trace" or TERM_ENGINE_LOG="*=info"
+    '''
+    def __init__(self, capacity: int = 10_000):
+        self.records: deque[tuple[int, str, Level, str]] = deque(maxlen = capacity)
+        ''' The last records written '''
+
+        self._channels: dict[str, Channel] = {}
+
+        # the level of channels created after set_level('*', level)
+        self._default_level: Level = Level.OFF
+
+        # the file records are also written to, if any
+        self._file = None
+
+    def channel(self, name: str) -> Channel:
+        ''' Returns the channel with the name, creating it if it doesn't exist '''
+        channel = self._channels.get(name)
+
+        if channel is None: channel = self._channels[name] = Channel(name, self, self._default_level)
+
+        return channel
+
+    def set_level(self, name: str, level: Level) -> None:
+        ''' Sets the level of a channel, '*' sets the level of all the channels '''
+        if name == '*':
+            self._default_level = Level(level)
+
+            for channel in self._channels.values(): channel.set_level(level)
+        else:
+            self.channel(name).set_level(level)
+
+    def configure(self, spec: str) -> None:
+        ''' Sets the levels of channels from a spec like "collision=debug,render=trace" '''
+        for item in spec.split(','):
+            if '=' not in item: continue
+
+            name, level = item.split('=', 1)
+
+            self.set_level(name.strip(), Level[level.strip().upper()])
+
+    def write(self, channel: str, level: Level, message: str) -> None:
+        ''' Writes a record to the ring buffer, and the file if there is one '''
+        record = (time.perf_counter_ns(), channel, level, message)
+
+        self.records.append(record)
+
+        if self._file is not None: self._file.write(self.format(record) + '\n')
+
+    def to_file(self, path: str) -> None:
+        ''' Also writes every record to the file at path, line buffered '''
+        self.close()
+
+        self._file = open(path, 'a', buffering = 1, encoding = 'utf-8')
+
+    def close(self) -> None:
+        ''' Stops writing records to the file '''
+        if self._file is not None: self._file.close()
+
+        self._file = None
+
+    def format(self, record: tuple[int, str, Level, str]) -> str:
+        time_ns, channel, level, message = record
+
+        return f'{time_ns / 1e6:.3f}ms [{channel}] {level.name}: {message}'
+
+    def dump(self) -> list[str]:
+        ''' Returns the records in the ring buffer, formatted '''
+        return [self.format(record) for record in self.records]
+
+    def clear(self) -> None:
+        ''' Empties the ring buffer '''
+        self.records.clear()
+
+
+debug_log: DebugLog = DebugLog()
+''' The debug log of the engine '''
+
+# set the levels of the channels from the environment
+if os.environ.get('TERM_ENGINE_LOG'): debug_log.configure(os.environ['TERM_ENGINE_LOG'])
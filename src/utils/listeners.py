@@ -0,0 +1,22 @@
+class Listeners(list):
+    '''
+    The callbacks that follow a change of an object, e.g the bounds or the priority of a panel
+    - Callbacks are called with the object that changed, so one bound method can follow many objects
+      and is removed with that same bound method:
+
+    ```python
+     panel.priority_listeners.add(render_order.update)
+
+     panel.priority_listeners.remove(render_order.update)
+    ```
+    - It is a list, so checking if anything listens before building what changed costs no call
+    '''
+    __slots__ = ()
+
+    def add(self, listener) -> None:
+        ''' Adds a callback, called with the object whenever it changes '''
+        self.append(listener)
+
+    def notify(self, subject) -> None:
+        ''' Calls every callback with the object that changed '''
+        for listener in self: listener(subject)
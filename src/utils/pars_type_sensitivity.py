@@ -1,16 +1,19 @@
 
 from abc import ABC
 
+from .validation import STRICT_VALIDATION
+
 
 class ParsTypeSensitivity(ABC):
     def __init__(self, parent: str, arguments: list[tuple]):
         ''' Receives tuples as arguments
             - tuples contain 3: an parameter name, object and a type that the object will be validated against
+            - The arguments are only validated in ValidationMode.STRICT
         '''
         # the name of the parent class
         self._par_cls_nm: str = parent
 
-        self._validate_args('', arguments)
+        if STRICT_VALIDATION: self._validate_args('', arguments)
 
     def _validate_args(self, method, arguments):
         # iterate through the given args
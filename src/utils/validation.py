@@ -0,0 +1,37 @@
+from enum import Enum
+import os
+
+
+class ValidationMode(Enum):
+    '''
+    Defines how much the engine validates the arguments of its constructors and per frame calls
+    '''
+
+    # type check the arguments, raise TypeError on bad ones
+    STRICT = 1
+
+    # skip the type checks, for games that are known to pass good arguments
+    FAST = 2
+
+
+def _mode_from_environment() -> ValidationMode:
+    '''
+    Decides the validation mode once, when the module is imported
+    - From the TERM_ENGINE_VALIDATION environment variable, e.g TERM_ENGINE_VALIDATION="fast"
+    - Else FAST when python runs optimized (python -O), STRICT otherwise
+    '''
+    name = os.environ.get('TERM_ENGINE_VALIDATION')
+
+    if name:
+        try: return ValidationMode[name.strip().upper()]
+        except KeyError:
+            raise ValueError(f'TERM_ENGINE_VALIDATION accepts only {[mode.name.lower() for mode in ValidationMode]}, {name!r} given') from None
+
+    return ValidationMode.STRICT if __debug__ else ValidationMode.FAST
+
+
+validation_mode: ValidationMode = _mode_from_environment()
+''' The validation mode of the engine, it can't change after import '''
+
+STRICT_VALIDATION: bool = validation_mode == ValidationMode.STRICT
+''' True if arguments are type checked, call sites check it with `if STRICT_VALIDATION:` '''
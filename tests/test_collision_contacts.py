@@ -0,0 +1,69 @@
+from src.components.drawing import Drawing
+from src.components.object import CollidableObject, CollisionType
+from src.metrics.vec2 import Vec2
+from src.systems.collision_system import CollisionSystem
+
+
+class _Engine:
+    ''' The part of the engine the CollisionSystem reads '''
+    def __init__(self, objects):
+        self.collidable_objects = objects
+
+
+def _tick(system: CollisionSystem, engine: _Engine):
+    # the position flags are reset by Object.update every tick
+    for obj in engine.collidable_objects: obj.on_floor = False
+
+    system.run_all(engine)
+
+
+def _types(obj: CollidableObject) -> list[CollisionType]:
+    return [collision.collisionType for collision in obj.collisions]
+
+
+def _player_on_platform():
+    player = CollidableObject(['player'], Drawing('player', ['##']), Vec2(0, 0))
+    platform = CollidableObject(['platform'], Drawing('platform', ['#' * 10]), Vec2(0, 1))
+
+    return player, platform
+
+
+def test_contact_starts_continues_and_ends():
+    player, platform = _player_on_platform()
+    system, engine = CollisionSystem(), _Engine([player, platform])
+
+    _tick(system, engine)
+    assert _types(player) == [CollisionType.START]
+    assert _types(platform) == [CollisionType.START]
+
+    _tick(system, engine)
+    assert _types(player) == [CollisionType.CONTINUING]
+    assert player.ended_collisions == []
+
+    player.pos.x = 30
+
+    _tick(system, engine)
+    assert player.collisions == []
+    assert platform.collisions == []
+    assert [(c.object, c.collisionType) for c in player.ended_collisions] == [(platform, CollisionType.END)]
+    assert [(c.object, c.collisionType) for c in platform.ended_collisions] == [(player, CollisionType.END)]
+
+    # the END is only given on the tick after the contact stops
+    _tick(system, engine)
+    assert player.collisions == [] and player.ended_collisions == []
+
+
+def test_walking_off_a_platform_leaves_the_floor():
+    player, platform = _player_on_platform()
+    system, engine = CollisionSystem(), _Engine([player, platform])
+
+    _tick(system, engine)
+    assert player.on_floor
+
+    # walk off the platform, on the same row
+    player.pos.x = 30
+
+    _tick(system, engine)
+    assert not player.on_floor
+    assert player.collisions == []
+    assert len(player.ended_collisions) == 1
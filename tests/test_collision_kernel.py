@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from src.components.drawing import Drawing
+from src.components.object import CollidableObject, ColliderFill
+from src.metrics.vec2 import Vec2
+from src.systems.collision_system import CollisionSystem
+
+
+class _Engine:
+    ''' The part of the engine the CollisionSystem reads '''
+    def __init__(self, objects):
+        self.collidable_objects = objects
+
+
+def _random_scene(rng: random.Random, count: int) -> list[CollidableObject]:
+    objects = []
+
+    for i in range(count):
+        width, height = rng.randint(1, 4), rng.randint(1, 3)
+
+        objects.append(CollidableObject(
+            [str(i)],
+            Drawing(str(i), ['\n'.join(['#' * width] * height)]),
+            Vec2(rng.randint(0, 60), rng.randint(0, 30)),
+            colliderFill = rng.choice([ColliderFill.FILLED, ColliderFill.HOLLOW]),
+            layer = rng.choice([1, 2, 4]),
+            mask = rng.choice([1, 2, 4, 3, 7]),
+        ))
+
+    return objects
+
+
+# colliders on both sides of all_pairs_threshold, so both the all pairs and the spatial hash candidates are checked
+@pytest.mark.parametrize('count', [20, 200])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_kernel_matches_the_scalar_reference(count: int, seed: int):
+    rng = random.Random(seed)
+
+    objects = _random_scene(rng, count)
+    system, engine = CollisionSystem(cell_size = 5, all_pairs_threshold = 64), _Engine(objects)
+
+    for _ in range(4):
+        for obj in objects:
+            obj.pos.x += rng.randint(-2, 2)
+            obj.pos.y += rng.randint(-2, 2)
+
+        system.run_all(engine)
+
+        for obj in objects:
+            expected = {other for other in objects if system.collides(obj, other)}
+
+            assert {collision.object for collision in obj.collisions} == expected
@@ -0,0 +1,93 @@
+from typing import override
+
+import pytest
+
+from src.components._interfaces import ALL_LAYERS, DEFAULT_LAYER
+from src.components.drawing import Drawing
+from src.components.object import CollidableObject, CollisionType, ColliderFill
+from src.components.object_pool import ObjectPool
+from src.metrics.vec2 import Vec2
+
+
+class Bullet(CollidableObject):
+    def __init__(self, velocity: Vec2 = Vec2(0, 0), **kwargs):
+        super().__init__(**kwargs)
+
+        self.velocity: Vec2 = Vec2(velocity.x, velocity.y)
+
+    @override
+    def reset(self, velocity: Vec2 = None, **kwargs):
+        if velocity is not None: self.velocity = Vec2(velocity.x, velocity.y)
+
+        super().reset(**kwargs)
+
+
+def _dispose(pool: ObjectPool, obj):
+    # as the garbage collector does
+    obj.dispose()
+    pool.release(obj)
+
+
+def test_released_objects_are_reused_from_the_next_frame():
+    pool, drawing = ObjectPool(), Drawing('bullet', ['-'])
+
+    bullet = pool.acquire(Bullet, drawing, tags = ['bullet'])
+    _dispose(pool, bullet)
+
+    # released objects are quarantined until the pool is recycled
+    assert pool.acquire(Bullet, drawing, tags = ['bullet']) is not bullet
+
+    pool.recycle()
+
+    assert pool.acquire(Bullet, drawing, tags = ['bullet']) is bullet
+    assert (pool.constructed, pool.reused) == (2, 1)
+
+    # objects are pooled by class and drawing
+    _dispose(pool, bullet)
+    pool.recycle()
+
+    assert pool.acquire(Bullet, Drawing('other', ['-'])) is not bullet
+    assert pool.acquire(CollidableObject, drawing) is not bullet
+    assert pool.acquire(Bullet, drawing) is bullet
+
+
+def test_reused_objects_are_reset_with_the_arguments_given():
+    pool, drawing = ObjectPool(), Drawing('bullet', ['-'])
+
+    bullet = pool.acquire(Bullet, drawing, tags = ['bullet'], position = Vec2(1, 1), velocity = Vec2(1, 0),
+                          layer = 2, mask = 4, isPersistent = True, colliderFill = ColliderFill.HOLLOW)
+    bullet.collide_with(bullet, CollisionType.START)
+    _dispose(pool, bullet)
+    pool.recycle()
+
+    position = Vec2(3, 3)
+
+    reused = pool.acquire(Bullet, drawing, tags = ['shot'], position = position, velocity = Vec2(0, -1),
+                          layer = 4, mask = 2, isPersistent = False)
+
+    assert reused is bullet
+    assert not reused.isGarbage
+    assert list(reused.tags) == ['shot']
+    assert (reused.pos.x, reused.pos.y) == (3, 3) and reused.pos is not position
+    assert (reused.velocity.x, reused.velocity.y) == (0, -1)
+    assert (reused.layer, reused.mask, reused.isPersistent) == (4, 2, False)
+    assert reused.collisions == []
+
+    # the arguments not given are reset to the constructor's defaults
+    assert reused.colliderFill == ColliderFill.FILLED
+
+    _dispose(pool, reused)
+    pool.recycle()
+
+    reused = pool.acquire(Bullet, drawing)
+
+    assert (reused.layer, reused.mask, reused.priority) == (DEFAULT_LAYER, ALL_LAYERS, 0)
+    assert list(reused.tags) == []
+    assert (reused.velocity.x, reused.velocity.y) == (0, 0)
+
+
+def test_arguments_reset_does_not_take_are_refused():
+    pool = ObjectPool()
+
+    with pytest.raises(TypeError, match = 'reset'):
+        pool.acquire(CollidableObject, Drawing('bullet', ['-']), velocity = Vec2(1, 0))